@@ -2,31 +2,126 @@
 Configuration settings for the Medallion Architecture Analytics Pipeline.
 
 This module defines configuration for:
+- Settings: frozen snapshot of environment variables, loaded once
 - AWS/SQS settings
 - DuckDB paths
 - Medallion layer paths (Bronze, Silver, Gold, Platinum)
 - Processing parameters
 """
 import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional
+
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Immutable snapshot of all environment-derived settings.
+    
+    Values are read from the environment (and the .env file) exactly once
+    per process by get_settings().
+    """
+    aws_region: str
+    aws_access_key_id: Optional[str]
+    aws_secret_access_key: Optional[str]
+    aws_session_token: Optional[str]
+    sqs_queue_url: Optional[str]
+    data_path: Path
+    bronze_path: Path
+    silver_path: Path
+    gold_path: Path
+    platinum_path: Path
+    duckdb_path: str
+    duckdb_threads: int
+    duckdb_memory_limit: str
+    duckdb_enable_object_cache: bool
+    duckdb_preserve_insertion_order: bool
+    save_parquet: bool
+    parquet_compression: str
+    parquet_row_group_size: int
+    batch_size: int
+    bronze_workers: int
+    bronze_compression: str
+    processing_interval: int
+    session_timeout_minutes: int
+    platinum_computation_interval: int
+    platinum_lookback_days: int
+    log_level: str
+    log_file: str
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings from the environment once and cache the result.
+    
+    Returns:
+        Frozen Settings instance shared by the whole process.
+    """
+    # Load environment variables from .env file
+    load_dotenv()
+    env = os.environ
+    
+    data_path = Path(env.get("DATA_PATH") or "data")
+    
+    return Settings(
+        aws_region=env.get("AWS_REGION", "us-east-1"),
+        aws_access_key_id=env.get("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=env.get("AWS_SECRET_ACCESS_KEY"),
+        aws_session_token=env.get("AWS_SESSION_TOKEN"),
+        sqs_queue_url=env.get("SQS_QUEUE_URL"),
+        data_path=data_path,
+        bronze_path=Path(env.get("BRONZE_PATH") or data_path / "bronze"),
+        silver_path=Path(env.get("SILVER_PATH") or data_path / "silver"),
+        gold_path=Path(env.get("GOLD_PATH") or data_path / "gold"),
+        platinum_path=Path(env.get("PLATINUM_PATH") or data_path / "platinum"),
+        duckdb_path=env.get("DUCKDB_PATH", str(data_path / "analytics.duckdb")),
+        duckdb_threads=int(env.get("DUCKDB_THREADS", "4")),
+        duckdb_memory_limit=env.get("DUCKDB_MEMORY_LIMIT", "2GB"),
+        duckdb_enable_object_cache=env.get("DUCKDB_ENABLE_OBJECT_CACHE", "true").lower() == "true",
+        duckdb_preserve_insertion_order=env.get("DUCKDB_PRESERVE_INSERTION_ORDER", "false").lower() == "true",
+        save_parquet=env.get("SAVE_PARQUET", "true").lower() == "true",
+        parquet_compression=env.get("PARQUET_COMPRESSION", "zstd"),
+        parquet_row_group_size=int(env.get("PARQUET_ROW_GROUP_SIZE", "122880")),
+        batch_size=int(env.get("BATCH_SIZE", "100")),
+        bronze_workers=int(env.get("BRONZE_WORKERS") or os.cpu_count() or 4),
+        bronze_compression=env.get("BRONZE_COMPRESSION", "zstd").lower(),
+        processing_interval=int(env.get("PROCESSING_INTERVAL", "60")),
+        session_timeout_minutes=int(env.get("SESSION_TIMEOUT_MINUTES", "30")),
+        platinum_computation_interval=int(env.get("PLATINUM_COMPUTATION_INTERVAL", "60")),
+        platinum_lookback_days=int(env.get("PLATINUM_LOOKBACK_DAYS", "7")),
+        log_level=env.get("LOG_LEVEL", "INFO"),
+        log_file=env.get("LOG_FILE", "pipeline.log"),
+    )
+
+
+settings = get_settings()
+
+# Read-only dict-style view of the settings
+settings_view = MappingProxyType({f.name: getattr(settings, f.name) for f in fields(settings)})
 
 # =============================================================================
 # AWS CONFIGURATION
 # =============================================================================
-AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_SESSION_TOKEN = os.getenv("AWS_SESSION_TOKEN")
+AWS_REGION = settings.aws_region
+AWS_ACCESS_KEY_ID = settings.aws_access_key_id
+AWS_SECRET_ACCESS_KEY = settings.aws_secret_access_key
+AWS_SESSION_TOKEN = settings.aws_session_token
 
 # =============================================================================
 # SQS CONFIGURATION
 # =============================================================================
 SQS_QUEUE_NAME = "data-engineering-case-analytics-queue"
-SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
+SQS_QUEUE_URL = settings.sqs_queue_url
 
 # Consumer settings
 MAX_MESSAGES_PER_BATCH = 20  # SQS maximum is 10
@@ -39,52 +134,74 @@ POLLING_INTERVAL = 5  # seconds between polling cycles
 # =============================================================================
 
 # Base data directory
-DATA_PATH = os.getenv("DATA_PATH", "data")
+DATA_PATH = settings.data_path
 
 # Bronze Layer - Raw JSON storage
-BRONZE_PATH = os.getenv("BRONZE_PATH", f"{DATA_PATH}/bronze")
+BRONZE_PATH = settings.bronze_path
 
 # Silver Layer - Parsed and cleaned data
-SILVER_PATH = os.getenv("SILVER_PATH", f"{DATA_PATH}/silver")
+SILVER_PATH = settings.silver_path
 
 # Gold Layer - Dimensional models and fact tables
-GOLD_PATH = os.getenv("GOLD_PATH", f"{DATA_PATH}/gold")
+GOLD_PATH = settings.gold_path
 
 # Platinum Layer - Aggregated metrics
-PLATINUM_PATH = os.getenv("PLATINUM_PATH", f"{DATA_PATH}/platinum")
+PLATINUM_PATH = settings.platinum_path
 
 # DuckDB database file (contains Silver, Gold, Platinum schemas)
-DUCKDB_PATH = os.getenv("DUCKDB_PATH", f"{DATA_PATH}/analytics.duckdb")
+DUCKDB_PATH = settings.duckdb_path
+
+# Layer name -> path lookup used by get_layer_path
+_LAYER_MAP: Mapping[str, Path] = MappingProxyType({
+    "bronze": BRONZE_PATH,
+    "silver": SILVER_PATH,
+    "gold": GOLD_PATH,
+    "platinum": PLATINUM_PATH,
+})
+
+# =============================================================================
+# DUCKDB SETTINGS
+# =============================================================================
+# Applied to every connection opened by DuckDBLoader
+DUCKDB_THREADS = settings.duckdb_threads
+DUCKDB_MEMORY_LIMIT = settings.duckdb_memory_limit
+DUCKDB_ENABLE_OBJECT_CACHE = settings.duckdb_enable_object_cache
+# false speeds up Parquet export; models must not rely on row order (use ORDER BY
+# or an explicit position such as generate_subscripts)
+DUCKDB_PRESERVE_INSERTION_ORDER = settings.duckdb_preserve_insertion_order
 
 # =============================================================================
 # PARQUET SETTINGS
 # =============================================================================
-SAVE_PARQUET = os.getenv("SAVE_PARQUET", "true").lower() == "true"
-PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "snappy")
+SAVE_PARQUET = settings.save_parquet
+PARQUET_COMPRESSION = settings.parquet_compression
+PARQUET_ROW_GROUP_SIZE = settings.parquet_row_group_size  # rows per Parquet row group
 
 # =============================================================================
 # PROCESSING CONFIGURATION
 # =============================================================================
-BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))  # Number of messages to accumulate before processing
-PROCESSING_INTERVAL = int(os.getenv("PROCESSING_INTERVAL", "60"))  # seconds between batch processing
+BATCH_SIZE = settings.batch_size  # Number of messages to accumulate before processing
+BRONZE_WORKERS = settings.bronze_workers  # threads preparing Bronze messages (default: CPU count)
+BRONZE_COMPRESSION = settings.bronze_compression  # "zstd" or "none" for plain NDJSON batch files
+PROCESSING_INTERVAL = settings.processing_interval  # seconds between batch processing
 
 # Session timeout for Gold layer session derivation
-SESSION_TIMEOUT_MINUTES = int(os.getenv("SESSION_TIMEOUT_MINUTES", "30"))
+SESSION_TIMEOUT_MINUTES = settings.session_timeout_minutes
 
 # =============================================================================
 # PLATINUM METRICS COMPUTATION
 # =============================================================================
 # How often to compute Platinum metrics (in minutes)
-PLATINUM_COMPUTATION_INTERVAL = int(os.getenv("PLATINUM_COMPUTATION_INTERVAL", "60"))
+PLATINUM_COMPUTATION_INTERVAL = settings.platinum_computation_interval
 
 # Days of data to include in metric computations
-PLATINUM_LOOKBACK_DAYS = int(os.getenv("PLATINUM_LOOKBACK_DAYS", "7"))
+PLATINUM_LOOKBACK_DAYS = settings.platinum_lookback_days
 
 # =============================================================================
 # LOGGING
 # =============================================================================
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "pipeline.log")
+LOG_LEVEL = settings.log_level
+LOG_FILE = settings.log_file
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -100,12 +217,11 @@ def ensure_directories():
     - data/gold/
     - data/platinum/
     """
-    paths = [BRONZE_PATH, SILVER_PATH, GOLD_PATH, PLATINUM_PATH]
-    for path in paths:
-        Path(path).mkdir(parents=True, exist_ok=True)
+    for path in (BRONZE_PATH, SILVER_PATH, GOLD_PATH, PLATINUM_PATH):
+        path.mkdir(parents=True, exist_ok=True)
 
 
-def get_layer_path(layer: str) -> str:
+def get_layer_path(layer: str) -> Path:
     """
     Get the path for a specific layer.
     
@@ -113,19 +229,12 @@ def get_layer_path(layer: str) -> str:
         layer: Layer name ('bronze', 'silver', 'gold', 'platinum').
         
     Returns:
-        Path string for the specified layer.
+        Path for the specified layer.
         
     Raises:
         ValueError: If an unknown layer is specified.
     """
-    layer_map = {
-        "bronze": BRONZE_PATH,
-        "silver": SILVER_PATH,
-        "gold": GOLD_PATH,
-        "platinum": PLATINUM_PATH,
-    }
-    
-    if layer not in layer_map:
-        raise ValueError(f"Unknown layer: {layer}. Valid options: {list(layer_map.keys())}")
-    
-    return layer_map[layer]
+    try:
+        return _LAYER_MAP[layer]
+    except KeyError:
+        raise ValueError(f"Unknown layer: {layer}. Valid options: {list(_LAYER_MAP.keys())}") from None
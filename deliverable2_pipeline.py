@@ -13,10 +13,13 @@ Usage:
 """
 import argparse
 import logging
+import queue
 import signal
 import sys
+import threading
 import time
 from pathlib import Path
+from typing import Optional
 
 import config
 from src.consumer import SQSConsumer
@@ -29,6 +32,7 @@ from src.loader import (
     export_silver_to_parquet,
     export_gold_to_parquet,
     get_layer_stats,
+    count_orphan_fact_items,
 )
 
 logging.basicConfig(
@@ -57,6 +61,8 @@ def process_batch(
     loader: DuckDBLoader,
     target_layer: str = "gold",
     delete_after_processing: bool = False,
+    save_parquet: bool = config.SAVE_PARQUET,
+    messages: Optional[list[dict]] = None,
 ) -> dict:
     """
     Process a batch of messages through the Medallion architecture.
@@ -67,6 +73,8 @@ def process_batch(
         loader: DuckDBLoader instance.
         target_layer: Target layer ('bronze', 'silver', 'gold').
         delete_after_processing: Whether to delete messages after processing.
+        save_parquet: Whether to export Silver/Gold tables to Parquet.
+        messages: Already received messages. If None, a batch is received from SQS.
         
     Returns:
         Dictionary with processing statistics.
@@ -76,51 +84,62 @@ def process_batch(
         "bronze_saved": 0,
         "silver_events": 0,
         "silver_items": 0,
+        "silver_rejected": 0,
         "gold_events": 0,
         "gold_items": 0,
         "errors": 0,
     }
     
-    messages = consumer.receive_messages()
+    if messages is None:
+        messages = consumer.receive_messages()
     stats["messages_received"] = len(messages)
     
     if not messages:
         return stats
     
-    logger.info(f"Received {len(messages)} messages from SQS")
+    logger.info("Received %s messages from SQS", len(messages))
     
     try:
         # === BRONZE ===
         bronze_paths = bronze.save_batch(messages)
-        stats["bronze_saved"] = len(bronze_paths)
-        logger.info(f"Bronze: Saved {len(bronze_paths)} raw messages")
+        stats["bronze_saved"] = bronze.last_saved_count
+        logger.info("Bronze: Saved %s raw messages", stats["bronze_saved"])
         
         if target_layer == "bronze":
             return stats
         
+        if not bronze.has_new_data():
+            logger.info("No new Bronze data, skipping Silver and Gold")
+            return stats
+        
         # === SILVER ===
-        silver_result = transform_to_silver(loader)
+        # Only the file written for this batch; earlier files are already in Silver
+        silver_result = transform_to_silver(loader, bronze_files=bronze_paths)
         stats["silver_events"] = silver_result["events_inserted"]
         stats["silver_items"] = silver_result["items_inserted"]
+        stats["silver_rejected"] = silver_result["events_rejected"]
+        silver_changed = stats["silver_events"] > 0 or stats["silver_items"] > 0
         
-        if config.SAVE_PARQUET:
+        if save_parquet and silver_changed:
             export_silver_to_parquet(loader)
         
         if target_layer == "silver":
             return stats
         
         # === GOLD ===
-        gold_result = transform_to_gold(loader)
-        stats["gold_events"] = gold_result["fact_events_inserted"]
-        stats["gold_items"] = gold_result["fact_items_inserted"]
-        
-        if config.SAVE_PARQUET:
-            export_gold_to_parquet(loader)
+        if silver_changed:
+            gold_result = transform_to_gold(loader)
+            stats["gold_events"] = gold_result["fact_events_inserted"]
+            stats["gold_items"] = gold_result["fact_items_inserted"]
+            
+            if save_parquet:
+                export_gold_to_parquet(loader)
+        else:
+            logger.info("No new Silver rows, skipping Gold")
         
         # Delete processed messages
         if delete_after_processing:
-            for msg in messages:
-                consumer.delete_message(msg["receipt_handle"])
+            consumer.delete_messages_batch([msg["receipt_handle"] for msg in messages])
                     
     except Exception as e:
         logger.error(f"Error processing batch: {e}")
@@ -130,6 +149,60 @@ def process_batch(
     return stats
 
 
+def receive_loop(
+    consumer: SQSConsumer,
+    message_queue: queue.Queue,
+    polling_interval: int,
+):
+    """
+    Poll SQS and hand non-empty batches to the processing loop.
+    
+    Runs in a background thread so the next long poll overlaps with the
+    DuckDB work of the current batch. The queue holds a single batch and
+    the receiver blocks on a full queue (backpressure), so at most two
+    batches wait behind the one being processed: one in the queue and one
+    held here. A held batch is released back to SQS on shutdown.
+    """
+    while running:
+        try:
+            messages = consumer.receive_messages()
+        except Exception as e:
+            logger.error(f"Error receiving messages: {e}")
+            time.sleep(polling_interval)
+            continue
+        
+        if not messages:
+            time.sleep(polling_interval)
+            continue
+        
+        while running:
+            try:
+                message_queue.put(messages, timeout=1)
+                break
+            except queue.Full:
+                continue
+        else:
+            release_messages(consumer, messages)
+
+
+def release_messages(consumer: SQSConsumer, messages: list[dict]):
+    """Make unprocessed messages visible in SQS again instead of waiting out their timeout."""
+    try:
+        consumer.release_messages([msg["receipt_handle"] for msg in messages])
+    except Exception as e:
+        logger.error(f"Error releasing unprocessed messages: {e}")
+
+
+def drain_queue(consumer: SQSConsumer, message_queue: queue.Queue):
+    """Release every batch still waiting in the queue."""
+    while True:
+        try:
+            messages = message_queue.get_nowait()
+        except queue.Empty:
+            return
+        release_messages(consumer, messages)
+
+
 def run_pipeline(
     consumer: SQSConsumer,
     bronze: BronzeTransformer,
@@ -138,41 +211,66 @@ def run_pipeline(
 ):
     """
     Run continuous polling loop through the Medallion architecture.
+    
+    SQS polling runs in a background thread (see receive_loop) while this
+    thread processes the previous batch through Bronze, Silver and Gold.
     """
     global running
     
-    logger.info(f"Starting pipeline - Target: {target_layer}, Interval: {config.POLLING_INTERVAL}s")
+    # Bind settings once so the polling loop does not re-read module globals
+    polling_interval = config.POLLING_INTERVAL
+    save_parquet = config.settings.save_parquet
+    
+    logger.info(f"Starting pipeline - Target: {target_layer}, Interval: {polling_interval}s")
     logger.info("Press Ctrl+C to stop")
     
     totals = {"messages": 0, "bronze": 0, "silver": 0, "gold": 0, "batches": 0}
     
+    message_queue: queue.Queue = queue.Queue(maxsize=1)
+    receiver = threading.Thread(
+        target=receive_loop,
+        args=(consumer, message_queue, polling_interval),
+        name="sqs-receiver",
+        daemon=True,
+    )
+    receiver.start()
+    
     while running:
         try:
-            stats = process_batch(consumer, bronze, loader, target_layer)
+            messages = message_queue.get(timeout=1)
+        except queue.Empty:
+            continue
+        
+        try:
+            stats = process_batch(
+                consumer, bronze, loader, target_layer,
+                save_parquet=save_parquet, messages=messages,
+            )
             
-            if stats["messages_received"] > 0:
-                totals["messages"] += stats["messages_received"]
-                totals["bronze"] += stats["bronze_saved"]
-                totals["silver"] += stats["silver_events"]
-                totals["gold"] += stats["gold_events"]
-                totals["batches"] += 1
-                
-                logger.info(
-                    f"Batch #{totals['batches']}: "
-                    f"Bronze={stats['bronze_saved']}, "
-                    f"Silver={stats['silver_events']}, "
-                    f"Gold={stats['gold_events']}"
-                )
+            totals["messages"] += stats["messages_received"]
+            totals["bronze"] += stats["bronze_saved"]
+            totals["silver"] += stats["silver_events"]
+            totals["gold"] += stats["gold_events"]
+            totals["batches"] += 1
             
-            if running:
-                time.sleep(config.POLLING_INTERVAL)
+            logger.info(
+                "Batch #%s: Bronze=%s, Silver=%s, Gold=%s",
+                totals["batches"],
+                stats["bronze_saved"],
+                stats["silver_events"],
+                stats["gold_events"],
+            )
                 
         except KeyboardInterrupt:
             running = False
         except Exception as e:
             logger.error(f"Error in pipeline: {e}")
             if running:
-                time.sleep(config.POLLING_INTERVAL)
+                time.sleep(polling_interval)
+    
+    # Let an in-flight long poll finish, then hand back what was never processed
+    receiver.join(timeout=config.WAIT_TIME_SECONDS + 5)
+    drain_queue(consumer, message_queue)
     
     logger.info(f"Pipeline stopped. Totals: {totals}")
 
@@ -200,9 +298,13 @@ def main():
         
         views_path = Path("sql/create_views.sql")
         if views_path.exists():
-            loader.execute_file(str(views_path))
+            loader.execute_file_if_changed(views_path)
         
-        bronze = BronzeTransformer(config.BRONZE_PATH)
+        bronze = BronzeTransformer(
+            config.BRONZE_PATH,
+            max_workers=config.BRONZE_WORKERS,
+            compression=config.BRONZE_COMPRESSION,
+        )
         consumer = SQSConsumer()
         
         try:
@@ -213,6 +315,11 @@ def main():
         run_pipeline(consumer, bronze, loader, target_layer=args.layer)
         
         logger.info(f"Final stats: {get_layer_stats(loader)}")
+        if args.layer == "gold":
+            orphans = count_orphan_fact_items(loader)
+            if orphans:
+                logger.warning(f"{orphans} fact_event_items rows reference missing fact_events")
+        bronze.close()
         loader.close()
         
     except Exception as e:
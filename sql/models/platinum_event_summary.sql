@@ -0,0 +1,75 @@
+-- Platinum Event Summary Model
+-- Folds fact_events rows added since the last run into platinum_event_summary
+-- fact_events is append-only, so new rows are those past the stored rowid
+-- transform_to_gold runs this script in a single transaction
+
+CREATE OR REPLACE TEMP TABLE stg_new_fact_events AS
+SELECT
+    rowid AS fact_rowid,
+    event_name::VARCHAR AS event_name,
+    user_id,
+    session_id,
+    event_timestamp
+FROM fact_events
+WHERE rowid > (SELECT COALESCE(MAX(last_rowid), -1) FROM platinum_event_summary_state);
+
+-- (event_name, user_id) and (event_name, session_id) pairs not seen before
+CREATE OR REPLACE TEMP TABLE stg_new_event_users AS
+SELECT DISTINCT n.event_name, n.user_id
+FROM stg_new_fact_events n
+ANTI JOIN platinum_event_users pu ON pu.event_name = n.event_name AND pu.user_id = n.user_id;
+
+CREATE OR REPLACE TEMP TABLE stg_new_event_sessions AS
+SELECT DISTINCT n.event_name, n.session_id
+FROM stg_new_fact_events n
+ANTI JOIN platinum_event_sessions ps ON ps.event_name = n.event_name AND ps.session_id = n.session_id
+WHERE n.session_id IS NOT NULL;
+
+INSERT INTO platinum_event_users SELECT event_name, user_id FROM stg_new_event_users;
+INSERT INTO platinum_event_sessions SELECT event_name, session_id FROM stg_new_event_sessions;
+
+-- Add the batch totals to the running summary
+INSERT INTO platinum_event_summary (
+    event_name,
+    event_count,
+    unique_users,
+    sessions,
+    first_event,
+    last_event,
+    updated_at
+)
+SELECT
+    b.event_name,
+    b.event_count,
+    COALESCE(u.new_users, 0) AS unique_users,
+    COALESCE(s.new_sessions, 0) AS sessions,
+    b.first_event,
+    b.last_event,
+    CURRENT_TIMESTAMP AS updated_at
+FROM (
+    SELECT
+        event_name,
+        COUNT(*) AS event_count,
+        MIN(event_timestamp) AS first_event,
+        MAX(event_timestamp) AS last_event
+    FROM stg_new_fact_events
+    GROUP BY event_name
+) b
+LEFT JOIN (
+    SELECT event_name, COUNT(*) AS new_users FROM stg_new_event_users GROUP BY event_name
+) u ON u.event_name = b.event_name
+LEFT JOIN (
+    SELECT event_name, COUNT(*) AS new_sessions FROM stg_new_event_sessions GROUP BY event_name
+) s ON s.event_name = b.event_name
+ON CONFLICT (event_name) DO UPDATE SET
+    event_count = event_count + excluded.event_count,
+    unique_users = unique_users + excluded.unique_users,
+    sessions = sessions + excluded.sessions,
+    first_event = LEAST(first_event, excluded.first_event),
+    last_event = GREATEST(last_event, excluded.last_event),
+    updated_at = excluded.updated_at;
+
+-- Advance the rowid watermark
+INSERT INTO platinum_event_summary_state (id, last_rowid)
+SELECT 1, MAX(fact_rowid) FROM stg_new_fact_events HAVING COUNT(*) > 0
+ON CONFLICT (id) DO UPDATE SET last_rowid = excluded.last_rowid;
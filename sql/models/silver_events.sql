@@ -1,21 +1,20 @@
 -- Silver Events Model
 -- Transforms Bronze JSON files into silver_events table
--- DuckDB auto-parses JSON into STRUCTs, so we use dot notation
+-- read_bronze() types the Bronze JSON into STRUCTs, so we use dot notation
 
 CREATE OR REPLACE TEMP TABLE stg_bronze_events AS
 SELECT 
     message_id::VARCHAR AS message_id,
     body.user_id::VARCHAR AS user_id,
-    body.event_name::VARCHAR AS event_name,
-    body.platform::VARCHAR AS platform,
+    TRY_CAST(body.event_name AS event_name_t) AS event_name,
+    TRY_CAST(body.platform AS platform_t) AS platform,
+    -- Raw values, kept so transform_to_silver can report rejected events
+    body.event_name::VARCHAR AS event_name_raw,
+    body.platform::VARCHAR AS platform_raw,
     body.event_timestamp::BIGINT AS event_timestamp_micros,
     body.replay_timestamp::VARCHAR AS replay_timestamp_str,
     body.items AS items_array
-FROM read_json_auto(
-    '{{ bronze_path }}/**/*.json',
-    maximum_object_size=10485760,
-    ignore_errors=true
-);
+FROM read_bronze($bronze_files);
 
 -- Insert new events into silver_events (incremental by message_id)
 INSERT INTO silver_events (
@@ -40,4 +39,8 @@ SELECT
     TRY_CAST(REPLACE(replay_timestamp_str, 'Z', '+00:00') AS TIMESTAMP) AS replay_timestamp,
     CURRENT_TIMESTAMP AS received_at
 FROM stg_bronze_events
-WHERE message_id NOT IN (SELECT message_id FROM silver_events);
+WHERE message_id NOT IN (SELECT message_id FROM silver_events)
+  -- Events outside the event_name_t / platform_t contract are not loaded;
+  -- transform_to_silver counts and logs them
+  AND event_name IS NOT NULL
+  AND platform IS NOT NULL;
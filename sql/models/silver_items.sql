@@ -8,18 +8,16 @@ WITH bronze_raw AS (
     SELECT 
         message_id::VARCHAR AS message_id,
         body.items AS items_list
-    FROM read_json_auto(
-        '{{ bronze_path }}/**/*.json',
-        maximum_object_size=10485760,
-        ignore_errors=true
-    )
+    FROM read_bronze($bronze_files)
     WHERE body.items IS NOT NULL
 ),
 unnested_items AS (
+    -- item_index is the 1-based position in the items array; generate_subscripts
+    -- unnests in lockstep with unnest, so it does not depend on row order
     SELECT 
         message_id,
         unnest(items_list) AS item,
-        ROW_NUMBER() OVER (PARTITION BY message_id) AS item_index
+        generate_subscripts(items_list, 1) AS item_index
     FROM bronze_raw
 )
 SELECT 
@@ -9,14 +9,81 @@ This module handles:
 """
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# SQS allows max 10 messages per batch delete
+DELETE_BATCH_MAX_ENTRIES = 10
+
+# Runs of 19+ digits may be integers outside the 64-bit range, which orjson
+# would turn into (lossy) floats
+_WIDE_NUMBER_RE = re.compile(r"\d{19,}")
+
+# Connection pool sized for concurrent batch deletes, with adaptive retries
+SQS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+)
+
+
+@lru_cache(maxsize=4)
+def get_sqs_client(
+    region: str,
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    aws_session_token: Optional[str] = None,
+):
+    """
+    Get a shared SQS client for the given region and credentials.
+
+    Clients are thread-safe, so consumers with the same region and
+    credentials reuse one client and its connection pool.
+
+    Args:
+        region: AWS region.
+        aws_access_key_id: AWS access key.
+        aws_secret_access_key: AWS secret key.
+        aws_session_token: AWS session token.
+
+    Returns:
+        boto3 SQS client.
+    """
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_session_token=aws_session_token,
+        config=SQS_CLIENT_CONFIG,
+    )
+
+
+def _loads_body(body: str):
+    """
+    Parse a JSON message body.
+
+    Bodies with long digit runs are parsed with the stdlib decoder, which
+    keeps integers wider than 64 bits exact; orjson handles the rest.
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON (orjson's
+            JSONDecodeError is a subclass).
+    """
+    if _WIDE_NUMBER_RE.search(body):
+        return json.loads(body)
+    return orjson.loads(body)
+
 
 class SQSConsumer:
     """Consumer class for reading messages from AWS SQS."""
@@ -44,13 +111,12 @@ class SQSConsumer:
         self.aws_secret_access_key = aws_secret_access_key or config.AWS_SECRET_ACCESS_KEY
         self.aws_session_token = aws_session_token or config.AWS_SESSION_TOKEN
 
-        # Initialize SQS client
-        self.sqs_client = boto3.client(
-            "sqs",
-            region_name=self.region,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            aws_session_token=self.aws_session_token,
+        # Initialize SQS client (shared across consumers with the same credentials)
+        self.sqs_client = get_sqs_client(
+            self.region,
+            self.aws_access_key_id,
+            self.aws_secret_access_key,
+            self.aws_session_token,
         )
 
         # Resolve queue URL
@@ -112,29 +178,10 @@ class SQSConsumer:
             )
 
             messages = response.get("Messages", [])
-            logger.debug(f"Received {len(messages)} messages from SQS")
+            logger.debug("Received %s messages from SQS", len(messages))
 
             # Parse message bodies
-            parsed_messages = []
-            for msg in messages:
-                try:
-                    parsed_msg = {
-                        "message_id": msg["MessageId"],
-                        "receipt_handle": msg["ReceiptHandle"],
-                        "body": json.loads(msg["Body"]),
-                        "attributes": msg.get("Attributes", {}),
-                        "message_attributes": msg.get("MessageAttributes", {}),
-                    }
-                    parsed_messages.append(parsed_msg)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse message {msg['MessageId']}: {e}")
-                    # Still include the message but with raw body
-                    parsed_messages.append({
-                        "message_id": msg["MessageId"],
-                        "receipt_handle": msg["ReceiptHandle"],
-                        "body": msg["Body"],
-                        "parse_error": str(e),
-                    })
+            parsed_messages = [self._parse_message(msg) for msg in messages]
 
             return parsed_messages
 
@@ -142,6 +189,36 @@ class SQSConsumer:
             logger.error(f"Error receiving messages: {e}")
             raise
 
+    @staticmethod
+    def _parse_message(msg: dict) -> dict:
+        """
+        Parse a raw SQS message into the pipeline message format.
+
+        Args:
+            msg: Message as returned by receive_message.
+
+        Returns:
+            Parsed message. If the body is not valid JSON, the raw body is
+            kept and the error is stored under 'parse_error'.
+        """
+        try:
+            return {
+                "message_id": msg["MessageId"],
+                "receipt_handle": msg["ReceiptHandle"],
+                "body": _loads_body(msg["Body"]),
+                "attributes": msg.get("Attributes", {}),
+                "message_attributes": msg.get("MessageAttributes", {}),
+            }
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse message {msg['MessageId']}: {e}")
+            # Still include the message but with raw body
+            return {
+                "message_id": msg["MessageId"],
+                "receipt_handle": msg["ReceiptHandle"],
+                "body": msg["Body"],
+                "parse_error": str(e),
+            }
+
     def delete_message(self, receipt_handle: str) -> bool:
         """
         Delete a message from the queue after successful processing.
@@ -157,18 +234,25 @@ class SQSConsumer:
                 QueueUrl=self.queue_url,
                 ReceiptHandle=receipt_handle,
             )
-            logger.debug(f"Deleted message with receipt handle: {receipt_handle[:20]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Deleted message with receipt handle: %s...", receipt_handle[:20])
             return True
         except ClientError as e:
             logger.error(f"Failed to delete message: {e}")
             return False
 
-    def delete_messages_batch(self, receipt_handles: list[str]) -> dict:
+    def delete_messages_batch(self, receipt_handles: list[str], max_workers: int = 4) -> dict:
         """
-        Delete multiple messages from the queue in a single request.
+        Delete multiple messages from the queue using batch requests.
+
+        Handles are split into chunks of 10 (the SQS limit per request) and
+        the chunks are sent concurrently. A chunk whose request fails has
+        all its entries reported as failed; the other chunks are still
+        collected.
 
         Args:
             receipt_handles: List of receipt handles to delete.
+            max_workers: Maximum number of concurrent batch requests.
 
         Returns:
             Dictionary with 'successful' and 'failed' lists.
@@ -176,30 +260,117 @@ class SQSConsumer:
         if not receipt_handles:
             return {"successful": [], "failed": []}
 
-        # SQS allows max 10 messages per batch delete
+        offsets = range(0, len(receipt_handles), DELETE_BATCH_MAX_ENTRIES)
+        chunks = [receipt_handles[offset:offset + DELETE_BATCH_MAX_ENTRIES] for offset in offsets]
+
+        if len(chunks) == 1:
+            responses = [self._delete_batch_chunk_or_fail(0, chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                responses = list(executor.map(self._delete_batch_chunk_or_fail, offsets, chunks))
+
+        successful = [entry for response in responses for entry in response.get("Successful", [])]
+        failed = [entry for response in responses for entry in response.get("Failed", [])]
+
+        if failed:
+            logger.warning(f"Failed to delete {len(failed)} messages: {failed}")
+
+        logger.info("Batch deleted %s messages", len(successful))
+        return {"successful": successful, "failed": failed}
+
+    def _delete_batch_chunk_or_fail(self, offset: int, receipt_handles: list[str]) -> dict:
+        """
+        Send a single delete_message_batch request, reporting request errors as failed entries.
+
+        Args:
+            offset: Position of the first handle in the full list, used for entry Ids.
+            receipt_handles: Up to 10 receipt handles to delete.
+
+        Returns:
+            delete_message_batch response, or one with every entry of the
+            chunk under 'Failed' if the request raised ClientError.
+        """
+        try:
+            return self._delete_batch_chunk(offset, receipt_handles)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            return {
+                "Successful": [],
+                "Failed": [
+                    {
+                        "Id": str(offset + i),
+                        "SenderFault": False,
+                        "Code": error.get("Code", "ClientError"),
+                        "Message": error.get("Message", str(e)),
+                    }
+                    for i in range(len(receipt_handles))
+                ],
+            }
+
+    def _delete_batch_chunk(self, offset: int, receipt_handles: list[str]) -> dict:
+        """
+        Send a single delete_message_batch request.
+
+        Args:
+            offset: Position of the first handle in the full list, used for entry Ids.
+            receipt_handles: Up to 10 receipt handles to delete.
+
+        Returns:
+            Raw delete_message_batch response.
+
+        Raises:
+            ClientError: If the batch request fails.
+        """
         entries = [
-            {"Id": str(i), "ReceiptHandle": handle}
-            for i, handle in enumerate(receipt_handles[:10])
+            {"Id": str(offset + i), "ReceiptHandle": handle}
+            for i, handle in enumerate(receipt_handles)
         ]
 
         try:
-            response = self.sqs_client.delete_message_batch(
+            return self.sqs_client.delete_message_batch(
                 QueueUrl=self.queue_url,
                 Entries=entries,
             )
+        except ClientError as e:
+            logger.error(f"Batch delete failed: {e}")
+            raise
 
-            successful = response.get("Successful", [])
-            failed = response.get("Failed", [])
+    def release_messages(self, receipt_handles: list[str]) -> dict:
+        """
+        Make received but unprocessed messages visible again right away.
 
-            if failed:
-                logger.warning(f"Failed to delete {len(failed)} messages: {failed}")
+        Sets their visibility timeout to 0, so other consumers (or the next
+        run) get them without waiting for the timeout to expire.
 
-            logger.info(f"Batch deleted {len(successful)} messages")
-            return {"successful": successful, "failed": failed}
+        Args:
+            receipt_handles: List of receipt handles to release.
 
-        except ClientError as e:
-            logger.error(f"Batch delete failed: {e}")
-            raise
+        Returns:
+            Dictionary with 'successful' and 'failed' lists.
+        """
+        successful, failed = [], []
+        for offset in range(0, len(receipt_handles), DELETE_BATCH_MAX_ENTRIES):
+            entries = [
+                {"Id": str(offset + i), "ReceiptHandle": handle, "VisibilityTimeout": 0}
+                for i, handle in enumerate(receipt_handles[offset:offset + DELETE_BATCH_MAX_ENTRIES])
+            ]
+            try:
+                response = self.sqs_client.change_message_visibility_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=entries,
+                )
+            except ClientError as e:
+                logger.error(f"Failed to release messages: {e}")
+                failed.extend({"Id": entry["Id"], "Message": str(e)} for entry in entries)
+                continue
+            successful.extend(response.get("Successful", []))
+            failed.extend(response.get("Failed", []))
+
+        if failed:
+            logger.warning(f"Failed to release {len(failed)} messages: {failed}")
+
+        logger.info("Released %s unprocessed messages", len(successful))
+        return {"successful": successful, "failed": failed}
 
     def get_queue_attributes(self) -> dict:
         """
@@ -5,21 +5,100 @@ This module provides:
 - DuckDBLoader: Generic class for DuckDB operations and Parquet export
 - Transform functions: Specific transformations for Silver and Gold layers
 """
+import json
 import logging
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Union
 
 import duckdb
-import pandas as pd
+import pyarrow as pa
 
 import config
-from src.models import SILVER_SCHEMAS, GOLD_SCHEMAS
+from src.models import (
+    BRONZE_SCHEMAS,
+    SILVER_SCHEMAS,
+    GOLD_SCHEMAS,
+    PLATINUM_SCHEMAS,
+    SILVER_INDEXES,
+    GOLD_INDEXES,
+    EXPORT_WATERMARKS_SCHEMA,
+)
+from src.transformer import BRONZE_FILE_GLOB, parse_firebase_items, read_bronze_manifest
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 SQL_MODELS_PATH = Path("sql/models")
 
+# Template placeholders in SQL models, e.g. '{{ bronze_path }}'
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def _pandas():
+    """Import pandas on first use; it is only needed for DataFrame results."""
+    import pandas
+    return pandas
+
+
+@lru_cache(maxsize=64)
+def _load_model(model_name: str) -> tuple[
+    tuple[tuple[str, Optional[str]], ...], frozenset[str], Optional[tuple[duckdb.Statement, ...]]
+]:
+    """
+    Read and tokenize a SQL model template once per process.
+    
+    Models without template placeholders are also parsed into DuckDB
+    statements here, so run_model only binds their $name parameters.
+    
+    Args:
+        model_name: Name of the SQL model (without .sql extension).
+        
+    Returns:
+        Tuple of (segments, placeholders, statements). Each segment is a
+        (text, name) pair where name is None for literal SQL, or the
+        placeholder name with text holding the original '{{ name }}'
+        markup. statements is None for templated models or SQL that
+        DuckDB cannot parse as a whole.
+    """
+    sql_path = SQL_MODELS_PATH / f"{model_name}.sql"
+    
+    if not sql_path.exists():
+        raise FileNotFoundError(f"SQL model not found: {sql_path}")
+    
+    sql = sql_path.read_text(encoding="utf-8")
+    
+    segments = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(sql):
+        if match.start() > position:
+            segments.append((sql[position:match.start()], None))
+        segments.append((match.group(0), match.group(1)))
+        position = match.end()
+    if position < len(sql):
+        segments.append((sql[position:], None))
+    
+    placeholders = frozenset(name for _, name in segments if name is not None)
+    
+    statements = None
+    if not placeholders:
+        try:
+            statements = tuple(duckdb.extract_statements(sql))
+        except duckdb.ParserException as e:
+            logger.warning(f"Could not pre-parse SQL model {model_name}, will template it per call: {e}")
+    
+    logger.debug("Loaded SQL model %s with placeholders: %s", model_name, sorted(placeholders))
+    return tuple(segments), placeholders, statements
+
+
+def _firebase_items_json(text: str) -> str:
+    """Parse a Firebase items string and return it as a JSON document."""
+    return json.dumps(parse_firebase_items(text))
+
 
 class DuckDBLoader:
     """
@@ -30,12 +109,50 @@ class DuckDBLoader:
     - Schema initialization
     - SQL execution (queries, files, models)
     - Parquet export
+    
+    Instances are shared per database file: constructing a loader for a
+    db_path that already has one returns the existing instance, so the
+    connection and schema initialization are reused within the process.
+    Asking for the same file with a different data_path raises ValueError.
+    In-memory databases (":memory:") are never shared; each construction
+    gets its own database.
+    
+    Because the instance is shared, close() (and leaving the context
+    manager) closes the connection for every holder; their next call
+    reconnects through connect().
     """
 
+    _instances: dict[str, "DuckDBLoader"] = {}
+
+    def __new__(cls, db_path: Optional[str] = None, data_path: Union[str, Path] = "data"):
+        db_path = db_path or config.DUCKDB_PATH
+        if db_path == ":memory:":
+            instance = super().__new__(cls)
+            instance._initialized = False
+            return instance
+        
+        key = cls._instance_key(db_path)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance._initialized = False
+            cls._instances[key] = instance
+        elif instance._initialized and instance.data_path.resolve() != Path(data_path).resolve():
+            raise ValueError(
+                f"DuckDBLoader for {db_path} already exists with data_path "
+                f"{instance.data_path}, not {data_path}"
+            )
+        return instance
+
+    @staticmethod
+    def _instance_key(db_path: str) -> str:
+        """Normalize a database path so equivalent paths share an instance."""
+        return str(Path(db_path).resolve())
+
     def __init__(
         self,
         db_path: Optional[str] = None,
-        data_path: str = "data",
+        data_path: Union[str, Path] = "data",
     ):
         """
         Initialize the DuckDB loader.
@@ -44,6 +161,9 @@ class DuckDBLoader:
             db_path: Path to the DuckDB database file.
             data_path: Base path for data storage.
         """
+        if self._initialized:
+            return
+        
         self.db_path = db_path or config.DUCKDB_PATH
         self.data_path = Path(data_path)
         
@@ -56,33 +176,127 @@ class DuckDBLoader:
         for path in [self.bronze_path, self.silver_path, self.gold_path]:
             path.mkdir(parents=True, exist_ok=True)
         
+        # Export directories already created, to avoid a mkdir per export
+        self._ensured_dirs: set[Path] = set()
+        
         self.connection: Optional[duckdb.DuckDBPyConnection] = None
+        
+        # Fingerprints of DDL already applied, used to skip re-initialization
+        self._schema_hash: Optional[int] = None
+        self._file_mtimes: dict[str, float] = {}
+        self._watermarks_ready = False
+        self._indexed_layers: set[str] = set()
+        # Tables whose export directory was checked against the watermark
+        self._checked_exports: set[str] = set()
+        
+        self._initialized = True
         logger.info(f"DuckDBLoader initialized - DB: {self.db_path}")
 
     def connect(self) -> duckdb.DuckDBPyConnection:
-        """Establish connection to DuckDB."""
+        """Establish connection to DuckDB, applying the configured DuckDB settings."""
         if self.connection is None:
-            self.connection = duckdb.connect(self.db_path)
+            self.connection = duckdb.connect(self.db_path, config={
+                "threads": config.DUCKDB_THREADS,
+                "memory_limit": config.DUCKDB_MEMORY_LIMIT,
+                "enable_object_cache": config.DUCKDB_ENABLE_OBJECT_CACHE,
+                "preserve_insertion_order": config.DUCKDB_PRESERVE_INSERTION_ORDER,
+            })
+            self._register_functions()
             logger.info(f"Connected to DuckDB at {self.db_path}")
         return self.connection
 
+    def _register_functions(self):
+        """
+        Register Python scalar functions on the connection.
+        
+        parse_firebase_items(VARCHAR) -> JSON parses a raw Firebase/Java
+        toString() items string inside a query, e.g. for messages stored
+        with body.errors_parsing_items or for ad-hoc inspection.
+        
+        The pipeline itself never calls it, so a registration failure is
+        logged instead of failing the connection.
+        """
+        conn = self.connection
+        try:
+            conn.create_function(
+                "parse_firebase_items",
+                _firebase_items_json,
+                [conn.type("VARCHAR")],
+                conn.type("JSON"),
+                type="native",
+            )
+        except (duckdb.Error, TypeError) as e:
+            logger.warning(f"Could not register parse_firebase_items function: {e}")
+
     def close(self):
-        """Close the DuckDB connection."""
+        """
+        Close the DuckDB connection.
+        
+        The loader is shared per database file, so this closes it for every
+        holder; later calls reconnect lazily through connect().
+        """
         if self.connection:
             self.connection.close()
             self.connection = None
+            # An in-memory database is gone once closed, so DDL must be re-applied
+            if self.db_path == ":memory:":
+                self._schema_hash = None
+                self._file_mtimes.clear()
+                self._watermarks_ready = False
+                self._indexed_layers.clear()
+                self._checked_exports.clear()
             logger.info("DuckDB connection closed")
 
-    def query(self, sql: str) -> pd.DataFrame:
-        """Execute a SQL query and return results as DataFrame."""
-        return self.connect().execute(sql).fetchdf()
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed statements in a single DuckDB transaction.
+        
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        conn = self.connect()
+        conn.begin()
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def query_arrow(self, sql: str) -> pa.Table:
+        """Execute a SQL query and return results as an Arrow table."""
+        result = self.connect().execute(sql)
+        # to_arrow_table() replaces fetch_arrow_table(), deprecated in DuckDB 1.5
+        fetch = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+        return fetch()
+
+    def query(self, sql: str) -> "pd.DataFrame":
+        """Execute a SQL query and return results as an Arrow-backed DataFrame."""
+        return self.query_arrow(sql).to_pandas(types_mapper=_pandas().ArrowDtype)
 
     def execute(self, sql: str):
         """Execute a single SQL statement."""
         self.connect().execute(sql)
 
     def execute_statements(self, sql: str):
-        """Execute multiple SQL statements separated by semicolons."""
+        """
+        Execute multiple SQL statements separated by semicolons.
+        
+        The whole script is handed to DuckDB, whose parser handles comments
+        and quoted semicolons. If DuckDB cannot parse the script, it is
+        re-run statement by statement to report the failing statement.
+        """
+        try:
+            self.connect().execute(sql)
+        except duckdb.ParserException as e:
+            logger.warning(f"Could not parse SQL script, executing statement by statement: {e}")
+            self._execute_split_statements(sql)
+        except Exception as e:
+            logger.error(f"Error executing SQL script: {e}")
+            raise
+
+    def _execute_split_statements(self, sql: str):
+        """Split a SQL script on line-ending semicolons and execute each statement."""
         conn = self.connect()
         
         # Remove SQL comments (lines starting with --)
@@ -117,7 +331,8 @@ class DuckDBLoader:
         for i, statement in enumerate(statements):
             if statement:
                 try:
-                    logger.debug(f"Executing statement {i+1}/{len(statements)}: {statement[:100]}...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Executing statement %s/%s: %s...", i + 1, len(statements), statement[:100])
                     conn.execute(statement)
                 except Exception as e:
                     logger.error(f"Error executing SQL statement {i+1}: {e}")
@@ -126,95 +341,271 @@ class DuckDBLoader:
 
     def execute_file(self, sql_file_path: str):
         """Execute SQL statements from a file."""
-        with open(sql_file_path, "r") as f:
-            self.execute_statements(f.read())
+        self.execute_statements(Path(sql_file_path).read_text(encoding="utf-8"))
         logger.info(f"Executed SQL file: {sql_file_path}")
 
+    def execute_file_if_changed(self, sql_file_path: Union[str, Path]) -> bool:
+        """
+        Execute a SQL file only if it changed since it was last executed.
+        
+        Args:
+            sql_file_path: Path to the SQL file.
+            
+        Returns:
+            True if the file was executed, False if it was skipped.
+        """
+        key = str(sql_file_path)
+        mtime = Path(sql_file_path).stat().st_mtime
+        if self._file_mtimes.get(key) == mtime:
+            logger.debug("SQL file unchanged, skipping: %s", sql_file_path)
+            return False
+        
+        self.execute_file(key)
+        self._file_mtimes[key] = mtime
+        return True
+
     def run_model(self, model_name: str, **kwargs):
         """
         Execute a SQL model file from sql/models/ directory.
         
+        The model is read and parsed once per process (see _load_model).
+        Models using $name parameters run their cached statements with the
+        values bound; legacy '{{ name }}' templates join the cached segments
+        with the given values.
+        
         Args:
             model_name: Name of the SQL model (without .sql extension).
-            **kwargs: Template variables to substitute (e.g., bronze_path).
+            **kwargs: Parameter or template values (e.g., bronze_path).
         """
-        sql_path = SQL_MODELS_PATH / f"{model_name}.sql"
+        segments, placeholders, statements = _load_model(model_name)
+        if statements is not None:
+            self._execute_model_statements(model_name, statements, kwargs)
+            return
         
-        if not sql_path.exists():
-            raise FileNotFoundError(f"SQL model not found: {sql_path}")
+        for key in kwargs.keys() - placeholders:
+            logger.warning(f"Template placeholder '{{{{ {key} }}}}' not found in SQL model {model_name}")
         
-        with open(sql_path, "r") as f:
-            sql = f.read()
-        
-        # Simple template rendering
-        for key, value in kwargs.items():
-            placeholder = f"{{{{ {key} }}}}"
-            if placeholder in sql:
-                sql = sql.replace(placeholder, str(value))
-                logger.debug(f"Replaced template '{placeholder}' with '{value}'")
-            else:
-                logger.warning(f"Template placeholder '{placeholder}' not found in SQL model {model_name}")
-        
-        # Check for unreplaced placeholders
-        import re
-        remaining = re.findall(r'\{\{.*?\}\}', sql)
+        # Check for placeholders without a value; they are left as-is
+        remaining = placeholders - kwargs.keys()
         if remaining:
-            logger.warning(f"Unreplaced placeholders in {model_name}: {remaining}")
+            logger.warning(f"Unreplaced placeholders in {model_name}: {sorted(remaining)}")
+        
+        sql = "".join(
+            str(kwargs[name]) if name in kwargs else text
+            for text, name in segments
+        )
         
         self.execute_statements(sql)
-        logger.debug(f"Executed SQL model: {model_name}")
+        logger.debug("Executed SQL model: %s", model_name)
 
-    def export_to_parquet(self, table_name: str, output_dir: Path, partition_col: str = None):
+    def _execute_model_statements(self, model_name: str, statements: tuple[duckdb.Statement, ...], params: dict):
+        """Run pre-parsed model statements, binding each one's $name parameters."""
+        used = set().union(*(stmt.named_parameters for stmt in statements))
+        for key in params.keys() - used:
+            logger.warning(f"Parameter '${key}' not used in SQL model {model_name}")
+        
+        conn = self.connect()
+        try:
+            for stmt in statements:
+                names = stmt.named_parameters
+                conn.execute(stmt, {name: params[name] for name in names} if names else None)
+        except KeyError as e:
+            raise ValueError(f"Missing parameter {e} for SQL model {model_name}") from None
+        except Exception as e:
+            logger.error(f"Error executing SQL model {model_name}: {e}")
+            raise
+        logger.debug("Executed SQL model: %s", model_name)
+
+    def export_to_parquet(
+        self,
+        table_name: str,
+        output_dir: Path,
+        partition_col: str = None,
+        incremental: bool = False,
+        sort_key: Optional[str] = None,
+        columns: str = "*",
+        compression: Optional[str] = None,
+        row_group_size: Optional[int] = None,
+    ):
         """
         Export a DuckDB table to Parquet files.
         
         Args:
             table_name: Name of the table to export.
             output_dir: Directory path for Parquet output.
-            partition_col: Optional column to partition by.
+            partition_col: Optional column to partition by (hive layout).
+            incremental: Only export rows appended since the previous export.
+                Tracks the last exported rowid, so it is meant for
+                append-only tables. Files are named after the rowid range
+                they hold, so files written by an export whose watermark
+                was never recorded are discarded and exported again
+                (see _discard_unrecorded_exports).
+            sort_key: Optional ORDER BY expression. Sorted files get tight
+                min/max statistics per row group, so range filters on the
+                key skip most of the file.
+            columns: Projection to export, e.g. to derive a partition column.
+            compression: Parquet codec. Defaults to PARQUET_COMPRESSION.
+            row_group_size: Rows per row group. Defaults to PARQUET_ROW_GROUP_SIZE.
         """
         conn = self.connect()
-        output_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
-        
-        if partition_col:
-            try:
-                conn.execute(f"""
-                    COPY (SELECT * FROM {table_name}) 
-                    TO '{output_dir}' 
-                    (FORMAT PARQUET, PARTITION_BY ({partition_col}))
-                """)
-            except Exception as e:
-                logger.warning(f"Partitioned export failed: {e}")
-                file_path = output_dir / f"data_{timestamp}.parquet"
-                conn.execute(f"COPY (SELECT * FROM {table_name}) TO '{file_path}' (FORMAT PARQUET)")
-        else:
-            file_path = output_dir / f"data_{timestamp}.parquet"
-            conn.execute(f"COPY (SELECT * FROM {table_name}) TO '{file_path}' (FORMAT PARQUET)")
-        
-        logger.debug(f"Exported {table_name} to Parquet: {output_dir}")
-
-    def read_parquet(self, parquet_path: Path) -> pd.DataFrame:
-        """Read Parquet files from a directory."""
+        if output_dir not in self._ensured_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+        
+        select_sql = f"SELECT {columns} FROM {table_name}"
+        file_stem = "data"
+        max_rowid = None
+        if incremental:
+            last_rowid = self._get_export_watermark(table_name)
+            if table_name not in self._checked_exports:
+                self._discard_unrecorded_exports(output_dir, last_rowid)
+                self._checked_exports.add(table_name)
+            new_rows, max_rowid = conn.execute(
+                f"SELECT COUNT(*), MAX(rowid) FROM {table_name} WHERE rowid > ?", [last_rowid]
+            ).fetchone()
+            if not new_rows:
+                logger.debug("No new rows in %s since last export, skipping", table_name)
+                return
+            select_sql += f" WHERE rowid > {last_rowid} AND rowid <= {max_rowid}"
+            file_stem = f"data_{last_rowid + 1}_{max_rowid}"
+        if sort_key:
+            select_sql += f" ORDER BY {sort_key}"
+        
+        options = (
+            f"FORMAT PARQUET, COMPRESSION '{compression or config.PARQUET_COMPRESSION}', "
+            f"ROW_GROUP_SIZE {row_group_size or config.PARQUET_ROW_GROUP_SIZE}"
+        )
+        
+        try:
+            if partition_col:
+                partition_options = f"{options}, PARTITION_BY ({partition_col}), FILENAME_PATTERN '{file_stem}_{{uuid}}'"
+                try:
+                    conn.execute(f"COPY ({select_sql}) TO '{output_dir}' ({partition_options}, APPEND true)")
+                except duckdb.Error as e:
+                    # DuckDB versions without APPEND: unique file names added to the existing partitions
+                    logger.warning(f"Partitioned export with APPEND failed, retrying without it: {e}")
+                    conn.execute(f"COPY ({select_sql}) TO '{output_dir}' ({partition_options}, OVERWRITE_OR_IGNORE true)")
+            elif incremental:
+                file_path = output_dir / f"{file_stem}.parquet"
+                conn.execute(f"COPY ({select_sql}) TO '{file_path}' ({options}, USE_TMP_FILE true)")
+            else:
+                # Full snapshot: replace the previous one instead of adding a file next to it
+                file_path = output_dir / "data.parquet"
+                conn.execute(f"COPY ({select_sql}) TO '{file_path}' ({options}, USE_TMP_FILE true)")
+                for stale in output_dir.glob("data_*.parquet"):
+                    stale.unlink(missing_ok=True)
+            
+            if max_rowid is not None:
+                self._set_export_watermark(table_name, max_rowid)
+        except Exception:
+            # Files may have been written past the watermark; clean them up on the next export
+            self._checked_exports.discard(table_name)
+            raise
+        
+        logger.debug("Exported %s to Parquet: %s", table_name, output_dir)
+
+    @staticmethod
+    def _discard_unrecorded_exports(output_dir: Path, last_rowid: int):
+        """
+        Delete incremental export files that the watermark does not cover.
+        
+        Incremental files are named data_<first rowid>_<last rowid>..., so a
+        file whose first rowid is past the watermark was written by an
+        export that failed before recording it. Without a watermark (a new
+        or rebuilt database) every Parquet file in output_dir is stale and
+        the table is exported again from its first row.
+        """
+        discarded = 0
+        for path in output_dir.rglob("*.parquet"):
+            parts = path.stem.split("_")
+            if last_rowid < 0 or (len(parts) >= 3 and parts[1].isdigit() and int(parts[1]) > last_rowid):
+                path.unlink(missing_ok=True)
+                discarded += 1
+        if discarded:
+            logger.warning("Discarded %s Parquet files in %s not covered by the export watermark", discarded, output_dir)
+
+    def _get_export_watermark(self, table_name: str) -> int:
+        """Get the last rowid exported for a table, or -1 if never exported."""
+        if not self._watermarks_ready:
+            self.execute_statements(EXPORT_WATERMARKS_SCHEMA)
+            self._watermarks_ready = True
+        
+        row = self.connect().execute(
+            "SELECT last_exported_rowid FROM _export_watermarks WHERE table_name = ?", [table_name]
+        ).fetchone()
+        return row[0] if row else -1
+
+    def _set_export_watermark(self, table_name: str, rowid: int):
+        """Record the last rowid exported for a table."""
+        self.connect().execute("""
+            INSERT INTO _export_watermarks (table_name, last_exported_rowid, exported_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                last_exported_rowid = excluded.last_exported_rowid,
+                exported_at = excluded.exported_at
+        """, [table_name, rowid])
+
+    def read_parquet_arrow(self, parquet_path: Path) -> pa.Table:
+        """Read Parquet files from a directory as an Arrow table."""
         if not parquet_path.exists():
             logger.warning(f"Path does not exist: {parquet_path}")
-            return pd.DataFrame()
+            return pa.table({})
         
         try:
-            return self.connect().execute(
-                f"SELECT * FROM read_parquet('{parquet_path}/**/*.parquet')"
-            ).fetchdf()
+            return self.query_arrow(f"SELECT * FROM read_parquet('{parquet_path}/**/*.parquet')")
         except Exception as e:
             logger.warning(f"Error reading parquet: {e}")
-            return pd.DataFrame()
+            return pa.table({})
+
+    def read_parquet(self, parquet_path: Path) -> "pd.DataFrame":
+        """Read Parquet files from a directory as an Arrow-backed DataFrame."""
+        return self.read_parquet_arrow(parquet_path).to_pandas(types_mapper=_pandas().ArrowDtype)
 
     def table_count(self, table_name: str) -> int:
-        """Get row count for a table."""
+        """
+        Get row count for a table.
+        
+        Reads the row count from DuckDB's catalog metadata instead of scanning
+        the table. The estimate is only inflated by deleted rows, which the
+        pipeline tables never have. Relations not in the catalog (e.g. views)
+        fall back to COUNT(*); missing tables count as 0.
+        """
+        conn = self.connect()
         try:
-            return self.connect().execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-        except:
+            row = conn.execute("""
+                SELECT estimated_size
+                FROM duckdb_tables()
+                WHERE table_name = ?
+                  AND database_name = current_database()
+                  AND schema_name = current_schema()
+            """, [table_name]).fetchone()
+            if row is not None:
+                return row[0]
+            return conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        except duckdb.Error:
             return 0
 
+    def table_counts(self, *table_names: str) -> dict[str, int]:
+        """
+        Get row counts for several tables with a single catalog lookup.
+        
+        Same semantics as table_count(); names not found in the catalog are
+        resolved one by one through table_count().
+        """
+        conn = self.connect()
+        try:
+            rows = conn.execute("""
+                SELECT table_name, estimated_size
+                FROM duckdb_tables()
+                WHERE table_name IN (SELECT unnest(?::VARCHAR[]))
+                  AND database_name = current_database()
+                  AND schema_name = current_schema()
+            """, [list(table_names)]).fetchall()
+        except duckdb.Error:
+            rows = []
+        counts = dict(rows)
+        return {name: counts[name] if name in counts else self.table_count(name) for name in table_names}
+
     def __enter__(self):
         self.connect()
         return self
@@ -233,88 +624,176 @@ def initialize_schemas(loader: DuckDBLoader, layers: list[str] = None):
     
     Args:
         loader: DuckDBLoader instance.
-        layers: List of layers to initialize ('silver', 'gold').
+        layers: List of layers to initialize ('bronze', 'silver', 'gold',
+            'platinum'). The Bronze layer only defines the read_bronze()
+            reader macro.
     """
-    layers = layers or ["silver", "gold"]
-    schema_map = {"silver": SILVER_SCHEMAS, "gold": GOLD_SCHEMAS}
+    layers = layers or ["bronze", "silver", "gold", "platinum"]
+    schema_map = {
+        "bronze": BRONZE_SCHEMAS,
+        "silver": SILVER_SCHEMAS,
+        "gold": GOLD_SCHEMAS,
+        "platinum": PLATINUM_SCHEMAS,
+    }
+    
+    # Skip the DDL if this loader already applied the same schemas
+    schema_hash = hash(tuple(
+        schema_sql for layer in layers for schema_sql in schema_map.get(layer, [])
+    ))
+    if loader._schema_hash == schema_hash:
+        logger.debug("Schemas already initialized for: %s", layers)
+        return
     
     for layer in layers:
         for schema_sql in schema_map.get(layer, []):
             loader.execute_statements(schema_sql)
-        logger.debug(f"{layer.capitalize()} schema initialized")
+        logger.debug("%s schema initialized", layer.capitalize())
+    
+    loader._schema_hash = schema_hash
+    logger.info("Schemas initialized for: %s", layers)
+
+
+def ensure_indexes(loader: DuckDBLoader, layer: str):
+    """
+    Create the secondary indexes of a layer, once per loader.
+    
+    Called after a layer's models run, so the first (bulk) load fills the
+    tables without maintaining their secondary indexes.
+    
+    Args:
+        loader: DuckDBLoader instance.
+        layer: Layer whose indexes to create ('silver', 'gold').
+    """
+    if layer in loader._indexed_layers:
+        return
+    
+    index_map = {"silver": SILVER_INDEXES, "gold": GOLD_INDEXES}
+    for index_sql in index_map.get(layer, []):
+        loader.execute_statements(index_sql)
     
-    logger.info(f"Schemas initialized for: {layers}")
+    loader._indexed_layers.add(layer)
+    logger.debug("%s indexes ensured", layer.capitalize())
 
 
 # =============================================================================
 # Layer Transformations
 # =============================================================================
 
-def transform_to_silver(loader: DuckDBLoader) -> dict:
+def transform_to_silver(loader: DuckDBLoader, bronze_files: Optional[list[Union[str, Path]]] = None) -> dict:
     """
     Transform Bronze JSON files to Silver tables using SQL models.
     
     Args:
         loader: DuckDBLoader instance.
+        bronze_files: Bronze files to load, e.g. the file written for the
+            current batch. Defaults to every file in the Bronze layer.
         
     Returns:
         Dictionary with transformation statistics.
     """
-    bronze_path_str = str(loader.bronze_path)
-    logger.info(f"Transforming Bronze to Silver from: {bronze_path_str}")
-    
-    # Verify bronze files exist
-    bronze_files = list(loader.bronze_path.rglob("*.json"))
-    logger.info(f"Found {len(bronze_files)} JSON files in Bronze")
-    
-    if not bronze_files:
-        logger.warning("No JSON files found in Bronze layer!")
-        return {"events_inserted": 0, "items_inserted": 0, "total_events": 0, "total_items": 0}
-    
-    # Test if DuckDB can read the JSON files
-    try:
-        test_count = loader.query(f"""
-            SELECT COUNT(*) as cnt 
-            FROM read_json_auto('{bronze_path_str}/**/*.json', maximum_object_size=10485760, ignore_errors=true)
-        """)
-        json_count = test_count['cnt'].iloc[0] if not test_count.empty else 0
-        logger.info(f"DuckDB can read {json_count} records from Bronze JSON files")
-    except Exception as e:
-        logger.error(f"Error testing JSON read: {e}")
-        json_count = 0
+    if bronze_files is None:
+        bronze_path_str = str(loader.bronze_path)
+        logger.info("Transforming Bronze to Silver from: %s", bronze_path_str)
+        
+        # Verify bronze files exist, from the manifest when Bronze has one
+        manifest = read_bronze_manifest(loader.bronze_path)
+        if manifest is None:
+            manifest = list(loader.bronze_path.glob(BRONZE_FILE_GLOB))
+        logger.info("Found %s JSON files in Bronze", len(manifest))
+        
+        if not manifest:
+            logger.warning("No JSON files found in Bronze layer!")
+            return {"events_inserted": 0, "items_inserted": 0, "events_rejected": 0, "total_events": 0, "total_items": 0}
+        
+        model_files = [f"{bronze_path_str}/{BRONZE_FILE_GLOB}"]
+    else:
+        model_files = [str(path) for path in bronze_files]
+        logger.info("Transforming %s Bronze files to Silver", len(model_files))
+        if not model_files:
+            return {"events_inserted": 0, "items_inserted": 0, "events_rejected": 0, "total_events": 0, "total_items": 0}
     
-    events_before = loader.table_count("silver_events")
-    items_before = loader.table_count("silver_items")
+    before = loader.table_counts("silver_events", "silver_items")
+    events_before = before["silver_events"]
+    items_before = before["silver_items"]
     
-    logger.info(f"Before transformation - Events: {events_before}, Items: {items_before}")
+    logger.info("Before transformation - Events: %s, Items: %s", events_before, items_before)
     
     try:
-        loader.run_model("silver_events", bronze_path=bronze_path_str)
+        loader.run_model("silver_events", bronze_files=model_files)
         logger.info("silver_events model executed successfully")
     except Exception as e:
         logger.error(f"Error running silver_events model: {e}")
         raise
     
     try:
-        loader.run_model("silver_items", bronze_path=bronze_path_str)
+        loader.run_model("silver_items", bronze_files=model_files)
         logger.info("silver_items model executed successfully")
     except Exception as e:
         logger.error(f"Error running silver_items model: {e}")
         raise
     
-    events_after = loader.table_count("silver_events")
-    items_after = loader.table_count("silver_items")
+    ensure_indexes(loader, "silver")
+    
+    events_rejected = count_rejected_silver_events(loader)
+    
+    after = loader.table_counts("silver_events", "silver_items")
+    events_after = after["silver_events"]
+    items_after = after["silver_items"]
     
     stats = {
         "events_inserted": events_after - events_before,
         "items_inserted": items_after - items_before,
+        "events_rejected": events_rejected,
         "total_events": events_after,
         "total_items": items_after,
     }
-    logger.info(f"Silver transformation complete: {stats}")
+    logger.info("Silver transformation complete: %s", stats)
     return stats
 
 
+def count_rejected_silver_events(loader: DuckDBLoader) -> int:
+    """
+    Count and log the staged Bronze events that silver_events did not load.
+    
+    The silver_events model discards events whose event_name or platform is
+    missing or outside the event_name_t / platform_t ENUMs (including values
+    in a different casing). Reads the model's stg_bronze_events staging
+    table, so it must run on the same connection right after the model.
+    
+    Returns:
+        Number of rejected events.
+    """
+    rejected = loader.connect().execute("""
+        SELECT event_name_raw, platform_raw, COUNT(*) AS events
+        FROM stg_bronze_events
+        WHERE (event_name IS NULL OR platform IS NULL)
+          AND message_id NOT IN (SELECT message_id FROM silver_events)
+        GROUP BY ALL
+        ORDER BY events DESC
+    """).fetchall()
+    
+    total = sum(events for _, _, events in rejected)
+    if total:
+        logger.warning(
+            "Rejected %s Bronze events with unknown event_name/platform: %s",
+            total,
+            ", ".join(f"{name!r}/{platform!r} x{events}" for name, platform, events in rejected),
+        )
+    return total
+
+
+def refresh_event_summary(loader: DuckDBLoader):
+    """
+    Fold fact_events rows added since the last refresh into platinum_event_summary.
+    
+    The model is rowid-watermarked, so it is a no-op once caught up. The
+    watermark and the distinct user/session tables must move together, so
+    the model runs as one transaction.
+    """
+    with loader.transaction():
+        loader.run_model("platinum_event_summary")
+
+
 def transform_to_gold(loader: DuckDBLoader) -> dict:
     """
     Transform Silver tables to Gold dimensional model using SQL models.
@@ -327,23 +806,29 @@ def transform_to_gold(loader: DuckDBLoader) -> dict:
     """
     logger.info("Transforming Silver to Gold...")
     
-    facts_before = loader.table_count("fact_events")
-    items_before = loader.table_count("fact_event_items")
-    dim_items_before = loader.table_count("dim_items")
-    dim_users_before = loader.table_count("dim_users")
+    # No-op once the schemas are in place; guarantees the Platinum tables exist
+    initialize_schemas(loader)
+    
+    gold_tables = ("fact_events", "fact_event_items", "dim_items", "dim_users")
+    before = loader.table_counts(*gold_tables)
     
     loader.run_model("gold_fact_events")
     loader.run_model("gold_fact_items")
     loader.run_model("gold_dim_items")
     loader.run_model("gold_dim_users")
+    ensure_indexes(loader, "gold")
     
+    # Keep the Platinum summary in step with the new fact_events rows
+    refresh_event_summary(loader)
+    
+    after = loader.table_counts(*gold_tables)
     stats = {
-        "fact_events_inserted": loader.table_count("fact_events") - facts_before,
-        "fact_items_inserted": loader.table_count("fact_event_items") - items_before,
-        "dim_items_inserted": loader.table_count("dim_items") - dim_items_before,
-        "dim_users_inserted": loader.table_count("dim_users") - dim_users_before,
+        "fact_events_inserted": after["fact_events"] - before["fact_events"],
+        "fact_items_inserted": after["fact_event_items"] - before["fact_event_items"],
+        "dim_items_inserted": after["dim_items"] - before["dim_items"],
+        "dim_users_inserted": after["dim_users"] - before["dim_users"],
     }
-    logger.info(f"Gold transformation complete: {stats}")
+    logger.info("Gold transformation complete: %s", stats)
     return stats
 
 
@@ -352,18 +837,37 @@ def transform_to_gold(loader: DuckDBLoader) -> dict:
 # =============================================================================
 
 def export_silver_to_parquet(loader: DuckDBLoader):
-    """Export all Silver tables to Parquet."""
-    loader.export_to_parquet("silver_events", loader.silver_path / "silver_events", "event_timestamp")
-    loader.export_to_parquet("silver_items", loader.silver_path / "silver_items")
+    """Export new rows of all Silver tables to Parquet."""
+    loader.export_to_parquet(
+        "silver_events",
+        loader.silver_path / "silver_events",
+        "event_date",
+        incremental=True,
+        sort_key="event_timestamp",
+        columns="*, CAST(event_timestamp AS DATE) AS event_date",
+    )
+    loader.export_to_parquet(
+        "silver_items", loader.silver_path / "silver_items", incremental=True, sort_key="event_id"
+    )
     logger.info("Silver tables exported to Parquet")
 
 
 def export_gold_to_parquet(loader: DuckDBLoader):
-    """Export all Gold tables to Parquet."""
-    loader.export_to_parquet("fact_events", loader.gold_path / "fact_events", "event_date")
-    loader.export_to_parquet("fact_event_items", loader.gold_path / "fact_event_items")
-    loader.export_to_parquet("dim_items", loader.gold_path / "dim_items")
-    loader.export_to_parquet("dim_users", loader.gold_path / "dim_users")
+    """
+    Export all Gold tables to Parquet.
+    
+    Fact tables are append-only and export only new rows; dimensions are
+    updated in place and are exported in full, replacing the previous
+    snapshot. Every export is sorted on its lookup key.
+    """
+    loader.export_to_parquet(
+        "fact_events", loader.gold_path / "fact_events", "event_date", incremental=True, sort_key="event_timestamp"
+    )
+    loader.export_to_parquet(
+        "fact_event_items", loader.gold_path / "fact_event_items", incremental=True, sort_key="event_id"
+    )
+    loader.export_to_parquet("dim_items", loader.gold_path / "dim_items", sort_key="item_id")
+    loader.export_to_parquet("dim_users", loader.gold_path / "dim_users", sort_key="user_id")
     logger.info("Gold tables exported to Parquet")
 
 
@@ -373,31 +877,53 @@ def export_gold_to_parquet(loader: DuckDBLoader):
 
 def get_layer_stats(loader: DuckDBLoader) -> dict:
     """Get row counts for all tables by layer."""
+    counts = loader.table_counts(
+        "silver_events", "silver_items",
+        "fact_events", "fact_event_items", "dim_items", "dim_users",
+    )
     return {
         "silver": {
-            "events": loader.table_count("silver_events"),
-            "items": loader.table_count("silver_items"),
+            "events": counts["silver_events"],
+            "items": counts["silver_items"],
         },
         "gold": {
-            "fact_events": loader.table_count("fact_events"),
-            "fact_items": loader.table_count("fact_event_items"),
-            "dim_items": loader.table_count("dim_items"),
-            "dim_users": loader.table_count("dim_users"),
+            "fact_events": counts["fact_events"],
+            "fact_items": counts["fact_event_items"],
+            "dim_items": counts["dim_items"],
+            "dim_users": counts["dim_users"],
         }
     }
 
 
-def get_event_summary(loader: DuckDBLoader) -> pd.DataFrame:
-    """Get a summary of events by type from Gold layer."""
+def count_orphan_fact_items(loader: DuckDBLoader) -> int:
+    """Count fact_event_items rows whose event_id is missing from fact_events."""
+    result = loader.query_arrow("""
+        SELECT COUNT(*) AS orphans
+        FROM fact_event_items fi
+        ANTI JOIN fact_events fe ON fe.event_id = fi.event_id
+    """)
+    return result.column("orphans")[0].as_py()
+
+
+def get_event_summary(loader: DuckDBLoader) -> "pd.DataFrame":
+    """
+    Get a summary of events by type.
+    
+    Reads the pre-aggregated platinum_event_summary table, which
+    transform_to_gold updates with each batch of new fact_events. Pending
+    fact_events rows (e.g. history in a database created before the
+    summary table existed) are folded in first.
+    """
+    initialize_schemas(loader)
+    refresh_event_summary(loader)
     return loader.query("""
         SELECT 
             event_name,
-            COUNT(*) as event_count,
-            COUNT(DISTINCT user_id) as unique_users,
-            COUNT(DISTINCT session_id) as sessions,
-            MIN(event_timestamp) as first_event,
-            MAX(event_timestamp) as last_event
-        FROM fact_events
-        GROUP BY event_name
+            event_count,
+            unique_users,
+            sessions,
+            first_event,
+            last_event
+        FROM platinum_event_summary
         ORDER BY event_count DESC
     """)
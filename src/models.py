@@ -104,6 +104,77 @@ class BronzeMessageModel(BaseModel):
 # DUCKDB SCHEMA DEFINITIONS
 # =============================================================================
 
+# Typed reader over Bronze JSON files (YYYY/MM/DD/*.json[.zst]), given as a
+# list of file paths or globs. An explicit schema skips JSON type inference
+# on every read and keeps column types stable; fields that do not match
+# their type read as NULL.
+BRONZE_READER_MACRO = """
+CREATE OR REPLACE MACRO read_bronze(bronze_files) AS TABLE
+SELECT * FROM read_json(
+    bronze_files,
+    columns = {
+        'message_id': 'VARCHAR',
+        'body': 'STRUCT(
+            event_timestamp BIGINT,
+            user_id VARCHAR,
+            event_name VARCHAR,
+            platform VARCHAR,
+            replay_timestamp VARCHAR,
+            items STRUCT(
+                item_id VARCHAR,
+                item_name VARCHAR,
+                item_brand VARCHAR,
+                item_variant VARCHAR,
+                item_category VARCHAR,
+                item_category2 VARCHAR,
+                item_category3 VARCHAR,
+                item_category4 VARCHAR,
+                item_category5 VARCHAR,
+                price_in_usd DOUBLE,
+                price DOUBLE,
+                quantity DOUBLE,
+                item_revenue_in_usd DOUBLE,
+                item_revenue DOUBLE,
+                item_refund_in_usd DOUBLE,
+                item_refund DOUBLE,
+                coupon VARCHAR,
+                affiliation VARCHAR,
+                location_id VARCHAR,
+                item_list_id VARCHAR,
+                item_list_name VARCHAR,
+                item_list_index DOUBLE,
+                promotion_id VARCHAR,
+                promotion_name VARCHAR,
+                creative_name VARCHAR,
+                creative_slot VARCHAR,
+                item_params STRUCT(
+                    key VARCHAR,
+                    value STRUCT(
+                        string_value VARCHAR,
+                        int_value BIGINT,
+                        float_value DOUBLE,
+                        double_value DOUBLE
+                    )
+                )[]
+            )[]
+        )'
+    },
+    maximum_object_size = 10485760,
+    ignore_errors = true
+);
+"""
+
+# Closed value sets from the source contract, stored as ENUMs (one byte per
+# value instead of a string) in silver_events and fact_events. CREATE TYPE IF
+# NOT EXISTS needs DuckDB 1.3.2+
+EVENT_TYPES_SCHEMA = """
+CREATE TYPE IF NOT EXISTS platform_t AS ENUM ('IOS', 'ANDROID');
+CREATE TYPE IF NOT EXISTS event_name_t AS ENUM ('view_item_list', 'view_item', 'begin_checkout', 'purchase');
+"""
+
+# Secondary indexes are kept apart from the table DDL: they are created
+# after the first load of each layer so a bulk load does not maintain them
+# row by row (see ensure_indexes in src/loader.py).
 SILVER_EVENTS_SCHEMA = """
 CREATE TABLE IF NOT EXISTS silver_events (
     event_id VARCHAR PRIMARY KEY,
@@ -111,12 +182,14 @@ CREATE TABLE IF NOT EXISTS silver_events (
     event_timestamp TIMESTAMP NOT NULL,
     event_timestamp_micros BIGINT NOT NULL,
     user_id VARCHAR NOT NULL,
-    event_name VARCHAR NOT NULL,
-    platform VARCHAR NOT NULL,
+    event_name event_name_t NOT NULL,
+    platform platform_t NOT NULL,
     replay_timestamp TIMESTAMP,
     received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+"""
 
+SILVER_EVENTS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_silver_events_timestamp ON silver_events(event_timestamp);
 CREATE INDEX IF NOT EXISTS idx_silver_events_user ON silver_events(user_id);
 CREATE INDEX IF NOT EXISTS idx_silver_events_name ON silver_events(event_name);
@@ -160,7 +233,9 @@ CREATE TABLE IF NOT EXISTS silver_items (
     number_of_installments INTEGER,
     installment_price VARCHAR
 );
+"""
 
+SILVER_ITEMS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_silver_items_event ON silver_items(event_id);
 CREATE INDEX IF NOT EXISTS idx_silver_items_item ON silver_items(item_id);
 CREATE INDEX IF NOT EXISTS idx_silver_items_list ON silver_items(item_list_name);
@@ -171,15 +246,17 @@ CREATE TABLE IF NOT EXISTS fact_events (
     event_id VARCHAR PRIMARY KEY,
     event_timestamp TIMESTAMP NOT NULL,
     user_id VARCHAR NOT NULL,
-    event_name VARCHAR NOT NULL,
-    platform VARCHAR NOT NULL,
+    event_name event_name_t NOT NULL,
+    platform platform_t NOT NULL,
     session_id VARCHAR,
     event_date VARCHAR NOT NULL,
     event_hour INTEGER NOT NULL,
     raw_message_id VARCHAR,
     processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+"""
 
+GOLD_FACT_EVENTS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_fact_events_timestamp ON fact_events(event_timestamp);
 CREATE INDEX IF NOT EXISTS idx_fact_events_user ON fact_events(user_id);
 CREATE INDEX IF NOT EXISTS idx_fact_events_name ON fact_events(event_name);
@@ -187,6 +264,10 @@ CREATE INDEX IF NOT EXISTS idx_fact_events_date ON fact_events(event_date);
 CREATE INDEX IF NOT EXISTS idx_fact_events_session ON fact_events(session_id);
 """
 
+# event_id references fact_events(event_id), but the FOREIGN KEY is not
+# declared: gold_fact_items only inserts rows joined to fact_events, and an
+# enforced FK costs an index probe per inserted row. Orphans can be checked
+# with count_orphan_fact_items() in src/loader.py.
 GOLD_FACT_EVENT_ITEMS_SCHEMA = """
 CREATE TABLE IF NOT EXISTS fact_event_items (
     event_item_id VARCHAR PRIMARY KEY,
@@ -203,10 +284,11 @@ CREATE TABLE IF NOT EXISTS fact_event_items (
     position_in_list INTEGER,
     has_discount BOOLEAN DEFAULT FALSE,
     discount_amount DECIMAL(12, 4),
-    in_stock BOOLEAN,
-    FOREIGN KEY (event_id) REFERENCES fact_events(event_id)
+    in_stock BOOLEAN
 );
+"""
 
+GOLD_FACT_EVENT_ITEMS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_fact_items_event ON fact_event_items(event_id);
 CREATE INDEX IF NOT EXISTS idx_fact_items_item ON fact_event_items(item_id);
 CREATE INDEX IF NOT EXISTS idx_fact_items_list ON fact_event_items(item_list_name);
@@ -227,7 +309,9 @@ CREATE TABLE IF NOT EXISTS dim_items (
     last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_current BOOLEAN DEFAULT TRUE
 );
+"""
 
+GOLD_DIM_ITEMS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_dim_items_id ON dim_items(item_id);
 CREATE INDEX IF NOT EXISTS idx_dim_items_current ON dim_items(is_current);
 """
@@ -243,18 +327,82 @@ CREATE TABLE IF NOT EXISTS dim_users (
     total_sessions INTEGER DEFAULT 0,
     is_current BOOLEAN DEFAULT TRUE
 );
+"""
 
+GOLD_DIM_USERS_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_dim_users_id ON dim_users(user_id);
 CREATE INDEX IF NOT EXISTS idx_dim_users_current ON dim_users(is_current);
 """
 
+# =============================================================================
+# PLATINUM LAYER SCHEMAS - Aggregated metrics
+# =============================================================================
+
+# Per-event_name totals over fact_events, maintained incrementally by the
+# platinum_event_summary model. Distinct users/sessions stay exact through
+# the (event_name, user_id) and (event_name, session_id) pairs seen so far.
+PLATINUM_EVENT_SUMMARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS platinum_event_summary (
+    event_name VARCHAR PRIMARY KEY,
+    event_count BIGINT NOT NULL,
+    unique_users BIGINT NOT NULL,
+    sessions BIGINT NOT NULL,
+    first_event TIMESTAMP,
+    last_event TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS platinum_event_users (
+    event_name VARCHAR NOT NULL,
+    user_id VARCHAR NOT NULL,
+    PRIMARY KEY (event_name, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS platinum_event_sessions (
+    event_name VARCHAR NOT NULL,
+    session_id VARCHAR NOT NULL,
+    PRIMARY KEY (event_name, session_id)
+);
+
+-- Last fact_events rowid folded into the summary
+CREATE TABLE IF NOT EXISTS platinum_event_summary_state (
+    id INTEGER PRIMARY KEY,
+    last_rowid BIGINT NOT NULL
+);
+"""
+
+# =============================================================================
+# PIPELINE METADATA
+# =============================================================================
+
+# High-watermark of rows already exported to Parquet, per table
+EXPORT_WATERMARKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS _export_watermarks (
+    table_name VARCHAR PRIMARY KEY,
+    last_exported_rowid BIGINT NOT NULL,
+    exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 
 # Schema collections by layer
-SILVER_SCHEMAS = [SILVER_EVENTS_SCHEMA, SILVER_ITEMS_SCHEMA]
+BRONZE_SCHEMAS = [BRONZE_READER_MACRO]
+SILVER_SCHEMAS = [EVENT_TYPES_SCHEMA, SILVER_EVENTS_SCHEMA, SILVER_ITEMS_SCHEMA]
 GOLD_SCHEMAS = [
+    EVENT_TYPES_SCHEMA,
     GOLD_FACT_EVENTS_SCHEMA,
     GOLD_FACT_EVENT_ITEMS_SCHEMA,
     GOLD_DIM_ITEMS_SCHEMA,
     GOLD_DIM_USERS_SCHEMA,
 ]
+PLATINUM_SCHEMAS = [PLATINUM_EVENT_SUMMARY_SCHEMA]
+
+# Index collections by layer
+SILVER_INDEXES = [SILVER_EVENTS_INDEXES, SILVER_ITEMS_INDEXES]
+GOLD_INDEXES = [
+    GOLD_FACT_EVENTS_INDEXES,
+    GOLD_FACT_EVENT_ITEMS_INDEXES,
+    GOLD_DIM_ITEMS_INDEXES,
+    GOLD_DIM_USERS_INDEXES,
+]
 
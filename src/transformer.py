@@ -9,41 +9,300 @@ Architecture Flow:
 """
 import json
 import logging
+import os
+import re
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+import orjson
+import zstandard
 from pydantic import ValidationError
 
 from src.models import BronzeMessageModel
 
 logger = logging.getLogger(__name__)
 
+# Bronze files live in YYYY/MM/DD partitions as .json or zstd-compressed .json.zst
+BRONZE_FILE_GLOB = "*/*/*/*.json*"
+
+# Append-only index of Bronze files, kept at the root of the Bronze layer
+# (outside the partitions, so BRONZE_FILE_GLOB never matches it)
+BRONZE_MANIFEST_NAME = "_manifest.jsonl"
+
+# Raw message shards kept open at once. Interleaved partitions (e.g. late
+# events around midnight) keep appending to their open shard.
+RAW_SHARD_CACHE_SIZE = 8
+
+# Tokens of the Firebase/Java toString() format: delimiters or runs of other text
+_FIREBASE_TOKEN_RE = re.compile(r"[{}\[\]=,]|[^{}\[\]=,]+")
+
+
+@lru_cache(maxsize=4096)
+def _parse_firebase_value(val: str):
+    """Convert a scalar Firebase value to None, int, float or str."""
+    val = val.strip()
+    if val == 'null' or val == '(not set)':
+        return None
+    try:
+        if '.' in val:
+            return float(val)
+        return int(val)
+    except ValueError:
+        return val
+
+
+def _parse_firebase_object(s: str) -> dict:
+    """Parse the inside of a Firebase object ('key=value, ...')."""
+    result = {}
+    depth = 0
+    key_parts = []
+    val_parts = []
+    in_key = True
+    
+    for token in _FIREBASE_TOKEN_RE.findall(s):
+        if token == '[' or token == '{':
+            depth += 1
+            if not in_key:
+                val_parts.append(token)
+        elif token == ']' or token == '}':
+            depth -= 1
+            if not in_key:
+                val_parts.append(token)
+        elif token == '=' and depth == 0 and in_key:
+            in_key = False
+        elif token == ',' and depth == 0:
+            if key_parts:
+                result[''.join(key_parts).strip()] = _parse_firebase_nested(''.join(val_parts))
+            key_parts = []
+            val_parts = []
+            in_key = True
+        elif in_key:
+            key_parts.append(token)
+        else:
+            val_parts.append(token)
+    
+    if key_parts:
+        result[''.join(key_parts).strip()] = _parse_firebase_nested(''.join(val_parts))
+    
+    return result
+
+
+def _parse_firebase_array(s: str) -> list:
+    """Parse a Firebase array of objects ('[{...}, {...}]')."""
+    result = []
+    depth = 0
+    current = []
+    in_object = False
+    
+    for token in _FIREBASE_TOKEN_RE.findall(s):
+        if token == '[' and not in_object:
+            depth += 1
+        elif token == ']' and not in_object:
+            depth -= 1
+        elif token == '{':
+            if in_object:
+                current.append(token)
+            in_object = True
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 1:
+                if current:
+                    result.append(_parse_firebase_object(''.join(current)))
+                    current = []
+                in_object = False
+            else:
+                current.append(token)
+        elif in_object:
+            current.append(token)
+    
+    return result
+
+
+def _parse_firebase_nested(s: str):
+    """Parse any Firebase value: array, object or scalar."""
+    s = s.strip()
+    if s.startswith('['):
+        return _parse_firebase_array(s)
+    elif s.startswith('{'):
+        return _parse_firebase_object(s[1:-1] if s.endswith('}') else s[1:])
+    else:
+        return _parse_firebase_value(s)
+
+
+def parse_firebase_items(text: str) -> list[dict]:
+    """
+    Parse a Firebase/Java toString() items string into a list of dicts.
+    
+    Args:
+        text: String in Firebase/Java toString() format.
+        
+    Returns:
+        List of dictionaries.
+    """
+    return _parse_firebase_nested(text)
+
+
+def _json_default(value):
+    """Encode datetimes for the stdlib encoder the way orjson does."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _dumps_message(message: dict) -> bytes:
+    """
+    Encode a message as compact UTF-8 JSON.
+    
+    datetime values are written natively as ISO-8601 strings (naive ones as
+    UTC). Other non-JSON types raise TypeError rather than being stringified.
+    
+    orjson only encodes integers that fit in 64 bits, so messages holding
+    wider ones (e.g. long numeric Firebase item ids) go through the stdlib
+    encoder, which writes them exactly.
+    """
+    try:
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            message, separators=(",", ":"), ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+
+
+def read_bronze_manifest(bronze_path: Union[str, Path]) -> Optional[list[dict]]:
+    """
+    Read the Bronze file manifest.
+    
+    Args:
+        bronze_path: Base path of the bronze layer.
+        
+    Returns:
+        List of manifest entries (path relative to bronze_path, partition
+        date, message count, bytes), or None if there is no manifest.
+        A file recorded more than once (e.g. a raw shard indexed when
+        opened and again when closed) is listed once, with its latest entry.
+    """
+    manifest_path = Path(bronze_path) / BRONZE_MANIFEST_NAME
+    entries = {}
+    try:
+        with open(manifest_path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry["path"]] = entry
+    except FileNotFoundError:
+        return None
+    return list(entries.values())
+
+
+def _scan_bronze_files(
+    bronze_path: Path,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> list[Path]:
+    """
+    Scan the YYYY/MM/DD partitions for Bronze files with os.scandir.
+    
+    Partitions outside [start_date, end_date] are pruned at the directory
+    level, so their files are never listed.
+    """
+    start = start_date.strftime("%Y-%m-%d") if start_date else None
+    end = end_date.strftime("%Y-%m-%d") if end_date else None
+    
+    def subdirs(path):
+        try:
+            with os.scandir(path) as it:
+                return sorted(e.name for e in it if e.is_dir() and e.name.isdigit())
+        except FileNotFoundError:
+            return []
+    
+    files = []
+    for year in subdirs(bronze_path):
+        if (start and year < start[:4]) or (end and year > end[:4]):
+            continue
+        for month in subdirs(bronze_path / year):
+            ym = f"{year}-{month}"
+            if (start and ym < start[:7]) or (end and ym > end[:7]):
+                continue
+            for day in subdirs(bronze_path / year / month):
+                ymd = f"{ym}-{day}"
+                if (start and ymd < start) or (end and ymd > end):
+                    continue
+                with os.scandir(bronze_path / year / month / day) as it:
+                    files.extend(
+                        Path(e.path) for e in it
+                        if e.is_file() and (e.name.endswith(".json") or e.name.endswith(".json.zst"))
+                    )
+    return sorted(files)
+
+
+@dataclass
+class _RawShard:
+    """An open append-only raw message shard and the messages written to it."""
+    fd: int
+    path: Path
+    messages: int = 0
+
 
 class BronzeTransformer:
     """
     Bronze layer transformer for raw data persistence.
     
-    Handles saving raw SQS messages as JSON files partitioned by date.
+    Handles saving raw SQS messages as JSON files partitioned by date;
+    batches are stored as newline-delimited JSON, one message per line.
     No transformation is applied - data is stored exactly as received.
     """
 
-    def __init__(self, bronze_path: str = "data/bronze"):
+    def __init__(
+        self,
+        bronze_path: Union[str, Path] = "data/bronze",
+        max_workers: Optional[int] = None,
+        use_legacy_items_parser: bool = False,
+        compression: Optional[str] = "zstd",
+    ):
         """
         Initialize the Bronze transformer.
         
         Args:
             bronze_path: Base path for bronze layer storage.
+            max_workers: Number of threads used to prepare a batch of messages.
+                Defaults to the number of CPUs.
+            use_legacy_items_parser: Parse Firebase items with the original
+                character-by-character parser instead of the tokenizer.
+            compression: Codec for batch files, "zstd" or None for plain JSON.
         """
+        if compression not in (None, "none", "zstd"):
+            raise ValueError(f"Unsupported Bronze compression: {compression}")
+        self._zstd = zstandard.ZstdCompressor(level=3) if compression == "zstd" else None
+        self.use_legacy_items_parser = use_legacy_items_parser
         self.bronze_path = Path(bronze_path)
         self.bronze_path.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 4,
+            thread_name_prefix="bronze-worker",
+        )
+        self._last_saved_count = 0
+        self._partition_cache: dict[tuple[int, int, int], Path] = {}
+        self._raw_shards: OrderedDict[Path, _RawShard] = OrderedDict()
+        self._manifest_path = self.bronze_path / BRONZE_MANIFEST_NAME
+        if not self._manifest_path.exists():
+            self._bootstrap_manifest()
         logger.info(f"Bronze transformer initialized with path: {self.bronze_path}")
 
     def _get_partition_path(self, timestamp: Optional[datetime] = None) -> Path:
         """
         Get the partition path based on timestamp.
         
+        Partition directories are created once and cached per day.
+        
         Args:
             timestamp: Event timestamp for partitioning. Defaults to now.
             
@@ -51,14 +310,70 @@ class BronzeTransformer:
             Path object for the partition directory.
         """
         ts = timestamp or datetime.utcnow()
-        partition = self.bronze_path / ts.strftime("%Y/%m/%d")
-        partition.mkdir(parents=True, exist_ok=True)
+        key = (ts.year, ts.month, ts.day)
+        partition = self._partition_cache.get(key)
+        if partition is None:
+            partition = self.bronze_path / f"{ts.year:04d}/{ts.month:02d}/{ts.day:02d}"
+            partition.mkdir(parents=True, exist_ok=True)
+            self._partition_cache[key] = partition
         return partition
 
+    def _manifest_entry(self, file_path: Path, messages: Optional[int]) -> dict:
+        """Build the manifest entry for a Bronze file."""
+        rel = file_path.relative_to(self.bronze_path)
+        parts = rel.parts
+        try:
+            date = datetime(int(parts[0]), int(parts[1]), int(parts[2])).strftime("%Y-%m-%d")
+        except (ValueError, IndexError):
+            date = None
+        return {
+            "path": rel.as_posix(),
+            "date": date,
+            "messages": messages,
+            "bytes": file_path.stat().st_size,
+        }
+
+    def _record_in_manifest(self, file_path: Path, messages: Optional[int]):
+        """Append a newly written Bronze file to the manifest."""
+        try:
+            entry = self._manifest_entry(file_path, messages)
+            with open(self._manifest_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            logger.error(f"Error updating Bronze manifest: {e}")
+
+    def _bootstrap_manifest(self):
+        """Index Bronze files written before the manifest existed."""
+        entries = [
+            self._manifest_entry(json_file, None)
+            for json_file in _scan_bronze_files(self.bronze_path)
+        ]
+        with open(self._manifest_path, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        if entries:
+            logger.info("Indexed %s existing Bronze files in manifest", len(entries))
+
     def _parse_items_firebase_format(self, text: str) -> list[dict]:
         """
         Robust parser for Firebase/Java toString() format.
         
+        Splits the text with a precompiled regex tokenizer and walks the
+        tokens, so work is per delimiter rather than per character.
+        
+        Args:
+            text: String in Firebase/Java toString() format.
+            
+        Returns:
+            List of dictionaries.
+        """
+        if self.use_legacy_items_parser:
+            return self._parse_items_firebase_format_legacy(text)
+        return parse_firebase_items(text)
+
+    def _parse_items_firebase_format_legacy(self, text: str) -> list[dict]:
+        """
+        Original character-by-character parser for Firebase/Java toString() format.
+        
         Args:
             text: String in Firebase/Java toString() format.
             
@@ -170,21 +485,77 @@ class BronzeTransformer:
         """
         Save a raw SQS message to the Bronze layer.
         
+        Messages are appended as JSON lines to one shard file per partition,
+        kept open with O_APPEND so each save is a single write() call.
+        
         Args:
             message: Raw message dictionary from SQS.
             timestamp: Optional timestamp for partitioning.
             
         Returns:
-            Path to the saved JSON file.
+            Path to the Bronze shard holding the message.
+            
+        Raises:
+            TypeError: If the message holds a value that is not JSON.
         """
-        message_id = message.get("message_id", str(uuid.uuid4()))
         partition_path = self._get_partition_path(timestamp)
+        self._parse_message_items(message)
+        line = _dumps_message(message) + b"\n"
+        
+        try:
+            shard = self._get_raw_shard(partition_path)
+            os.write(shard.fd, line)
+            shard.messages += 1
+            logger.debug("Saved raw message to Bronze: %s", shard.path)
+        except Exception as e:
+            logger.error(f"Error saving raw message to Bronze: {e}")
+            return None
+        
+        return str(shard.path)
+
+    def _get_raw_shard(self, partition_path: Path) -> _RawShard:
+        """
+        Get the open append-only shard for a partition, creating it if needed.
+        
+        Up to RAW_SHARD_CACHE_SIZE shards stay open; opening another closes
+        the least recently used one.
+        """
+        shard = self._raw_shards.get(partition_path)
+        if shard is not None:
+            self._raw_shards.move_to_end(partition_path)
+            return shard
+        
+        while len(self._raw_shards) >= RAW_SHARD_CACHE_SIZE:
+            _, oldest = self._raw_shards.popitem(last=False)
+            self._close_raw_shard(oldest)
         
-        # Create filename with timestamp for ordering
         file_ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"{file_ts}_{message_id}.json"
-        file_path = partition_path / filename
+        file_path = partition_path / f"{file_ts}_raw_{os.getpid()}.json"
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # Indexed right away so the shard is found even if the process dies;
+        # the entry is finalized when the shard is closed
+        self._record_in_manifest(file_path, None)
+        
+        shard = self._raw_shards[partition_path] = _RawShard(fd, file_path)
+        return shard
+
+    def _close_raw_shard(self, shard: _RawShard):
+        """Close a raw message shard and record its final size in the manifest."""
+        os.close(shard.fd)
+        self._record_in_manifest(shard.path, shard.messages)
+
+    def _close_raw_shards(self):
+        """Close every open raw message shard."""
+        while self._raw_shards:
+            _, shard = self._raw_shards.popitem(last=False)
+            self._close_raw_shard(shard)
+
+    def _parse_message_items(self, message: dict):
+        """
+        Convert Firebase toString() items into lists of dicts, in place.
         
+        Sets body.errors_parsing_items when the items string cannot be parsed.
+        """
         items = message["body"]["items"]
         message["body"]["errors_parsing_items"] = False
         if isinstance(items, str):
@@ -194,15 +565,6 @@ class BronzeTransformer:
                 logger.error(f"Error parsing items: {e}")
                 message["body"]["errors_parsing_items"] = True
         message["body"]["items"] = items
-        
-        try:
-            with open(file_path, "w") as f:
-                json.dump(message, f, indent=2, default=str)
-            logger.debug(f"Saved raw message to Bronze: {file_path}")
-            return str(file_path)
-        except Exception as e:
-            logger.error(f"Error saving raw message to Bronze: {e}")
-            return None
 
     def save_batch(
         self,
@@ -212,24 +574,81 @@ class BronzeTransformer:
         """
         Save a batch of raw messages to the Bronze layer.
         
+        The whole batch is written as a single newline-delimited JSON file
+        (one message per line) in the partition directory, compressed with
+        zstd unless compression is disabled. Messages are prepared
+        concurrently on the transformer's thread pool.
+        
         Args:
             messages: List of raw message dictionaries.
             timestamp: Optional timestamp for partitioning.
             
         Returns:
-            List of paths to saved JSON files.
+            List with the path of the Bronze file written for the batch
+            (empty if nothing was saved). The number of saved messages is
+            available from last_saved_count.
+            
+        Raises:
+            TypeError: If a message holds a value that is not JSON.
         """
-        saved_paths = []
-        for msg in messages:
-            try:
-                path = self.save_raw_message(msg, timestamp)
-                if path:
-                    saved_paths.append(path)
-            except Exception as e:
-                logger.error(f"Error saving message to Bronze: {e}")
+        self._last_saved_count = 0
+        lines = [line for line in self._executor.map(self._encode_message, messages) if line is not None]
+        if not lines:
+            return []
         
-        logger.info(f"Saved {len(saved_paths)} messages to Bronze layer")
-        return saved_paths
+        partition_path = self._get_partition_path(timestamp)
+        file_ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+        file_path = partition_path / f"{file_ts}_batch_{uuid.uuid4()}.json"
+        data = b"\n".join(lines) + b"\n"
+        if self._zstd is not None:
+            file_path = file_path.with_name(file_path.name + ".zst")
+            data = self._zstd.compress(data)
+        
+        try:
+            with open(file_path, "wb") as f:
+                f.write(data)
+        except Exception as e:
+            logger.error(f"Error saving batch to Bronze: {e}")
+            return []
+        
+        self._record_in_manifest(file_path, len(lines))
+        self._last_saved_count = len(lines)
+        logger.info("Saved %s messages to Bronze layer", len(lines))
+        return [str(file_path)]
+
+    @property
+    def last_saved_count(self) -> int:
+        """Number of messages written by the most recent save_batch call."""
+        return self._last_saved_count
+
+    def has_new_data(self) -> bool:
+        """Whether the most recent save_batch call wrote any messages."""
+        return self._last_saved_count > 0
+
+    def _encode_message(self, message: dict) -> Optional[bytes]:
+        """
+        Prepare a message and encode it as one JSON line.
+        
+        Returns None for malformed messages (e.g. without a body or items).
+        Encoding errors are raised: a value that is not JSON is a bug, not
+        a bad message, and must not silently drop data from Bronze.
+        """
+        try:
+            self._parse_message_items(message)
+        except Exception as e:
+            logger.error(f"Error saving message to Bronze: {e}")
+            return None
+        return _dumps_message(message)
+
+    def close(self):
+        """
+        Close open raw message shards and shut down the worker thread pool.
+        
+        Closing a shard records its final message count and size in the
+        manifest.
+        """
+        self._close_raw_shards()
+        self._executor.shutdown(wait=True)
 
     def validate_message(self, message: dict) -> Optional[BronzeMessageModel]:
         """
@@ -242,7 +661,7 @@ class BronzeTransformer:
             Validated BronzeMessageModel or None if validation fails.
         """
         try:
-            return BronzeMessageModel(**message)
+            return BronzeMessageModel.model_validate(message)
         except ValidationError as e:
             logger.warning(f"Bronze validation failed: {e}")
             return None
@@ -255,6 +674,9 @@ class BronzeTransformer:
         """
         List all Bronze JSON files within a date range.
         
+        Uses the Bronze manifest; without one, partition directories are
+        scanned and pruned by date.
+        
         Args:
             start_date: Start of date range. Defaults to all time.
             end_date: End of date range. Defaults to today.
@@ -262,18 +684,21 @@ class BronzeTransformer:
         Returns:
             List of Path objects to Bronze JSON files.
         """
+        manifest = read_bronze_manifest(self.bronze_path)
+        if manifest is None:
+            return _scan_bronze_files(self.bronze_path, start_date, end_date)
+        
+        # Manifest dates are ISO strings, so they compare as strings
+        start = start_date.strftime("%Y-%m-%d") if start_date else None
+        end = end_date.strftime("%Y-%m-%d") if end_date else None
         files = []
-        for json_file in self.bronze_path.rglob("*.json"):
-            try:
-                parts = json_file.relative_to(self.bronze_path).parts
-                if len(parts) >= 3:
-                    file_date = datetime(int(parts[0]), int(parts[1]), int(parts[2]))
-                    if start_date and file_date < start_date:
-                        continue
-                    if end_date and file_date > end_date:
-                        continue
-                files.append(json_file)
-            except (ValueError, IndexError):
-                files.append(json_file)
+        for entry in manifest:
+            date = entry["date"]
+            if date is not None:
+                if start and date < start:
+                    continue
+                if end and date > end:
+                    continue
+            files.append(self.bronze_path / entry["path"])
         
         return sorted(files)
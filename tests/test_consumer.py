@@ -0,0 +1,46 @@
+"""Tests for the SQS consumer."""
+from botocore.exceptions import ClientError
+
+from src.consumer import SQSConsumer
+
+
+def _sqs_message(body: str) -> dict:
+    return {"MessageId": "m-1", "ReceiptHandle": "rh-1", "Body": body}
+
+
+def test_parse_message_keeps_integers_wider_than_64_bits():
+    body = '{"user_id": "u-1", "item_id": 123456789012345678901234, "seq": -9223372036854775809}'
+
+    parsed = SQSConsumer._parse_message(_sqs_message(body))
+
+    assert parsed["body"]["item_id"] == 123456789012345678901234
+    assert parsed["body"]["seq"] == -9223372036854775809
+    assert "parse_error" not in parsed
+
+
+def test_parse_message_keeps_raw_body_when_not_json():
+    parsed = SQSConsumer._parse_message(_sqs_message("{not json"))
+
+    assert parsed["body"] == "{not json"
+    assert "parse_error" in parsed
+
+
+class _FailingChunkClient:
+    """SQS client stub whose batch delete fails for the chunk starting at Id '10'."""
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        if Entries[0]["Id"] == "10":
+            raise ClientError({"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, "DeleteMessageBatch")
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+
+def test_delete_messages_batch_reports_failed_chunk_and_keeps_the_rest():
+    consumer = SQSConsumer.__new__(SQSConsumer)
+    consumer.sqs_client = _FailingChunkClient()
+    consumer.queue_url = "https://sqs.example/queue"
+
+    result = consumer.delete_messages_batch([f"rh-{i}" for i in range(25)])
+
+    assert sorted(int(entry["Id"]) for entry in result["successful"]) == list(range(10)) + list(range(20, 25))
+    assert sorted(int(entry["Id"]) for entry in result["failed"]) == list(range(10, 20))
+    assert {entry["Code"] for entry in result["failed"]} == {"Throttling"}
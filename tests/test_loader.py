@@ -0,0 +1,92 @@
+"""Tests for the DuckDB loader."""
+import pytest
+
+from src.loader import DuckDBLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    loader = DuckDBLoader(str(tmp_path / "analytics.duckdb"), data_path=tmp_path / "data")
+    loader.execute("CREATE TABLE events (id INTEGER, event_date DATE)")
+    yield loader
+    loader.close()
+
+
+def _insert(loader: DuckDBLoader, ids: range):
+    for i in ids:
+        loader.execute(f"INSERT INTO events VALUES ({i}, DATE '2024-01-01' + {i % 3})")
+
+
+def _exported_ids(loader: DuckDBLoader, output_dir) -> list[int]:
+    table = loader.query_arrow(f"SELECT id FROM read_parquet('{output_dir}/**/*.parquet') ORDER BY id")
+    return table.column("id").to_pylist()
+
+
+@pytest.mark.parametrize("partition_col", [None, "event_date"])
+def test_incremental_export_twice_has_no_duplicates(loader, tmp_path, partition_col):
+    output_dir = tmp_path / "out"
+    _insert(loader, range(3))
+    loader.export_to_parquet("events", output_dir, partition_col, incremental=True)
+    loader.export_to_parquet("events", output_dir, partition_col, incremental=True)
+    _insert(loader, range(3, 5))
+    loader.export_to_parquet("events", output_dir, partition_col, incremental=True)
+
+    assert _exported_ids(loader, output_dir) == list(range(5))
+
+
+def test_export_failing_before_watermark_is_not_duplicated(loader, tmp_path, monkeypatch):
+    output_dir = tmp_path / "out"
+    _insert(loader, range(3))
+    loader.export_to_parquet("events", output_dir, "event_date", incremental=True)
+    _insert(loader, range(3, 5))
+
+    def crash(table_name, rowid):
+        raise RuntimeError("crashed before recording the watermark")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(loader, "_set_export_watermark", crash)
+        with pytest.raises(RuntimeError):
+            loader.export_to_parquet("events", output_dir, "event_date", incremental=True)
+
+    loader.export_to_parquet("events", output_dir, "event_date", incremental=True)
+
+    assert _exported_ids(loader, output_dir) == list(range(5))
+
+
+def test_rebuilt_database_reexports_without_duplicates(loader, tmp_path):
+    output_dir = tmp_path / "out"
+    _insert(loader, range(3))
+    loader.export_to_parquet("events", output_dir, "event_date", incremental=True)
+
+    rebuilt = DuckDBLoader(str(tmp_path / "rebuilt.duckdb"), data_path=tmp_path / "data")
+    try:
+        rebuilt.execute("CREATE TABLE events (id INTEGER, event_date DATE)")
+        _insert(rebuilt, range(4))
+        rebuilt.export_to_parquet("events", output_dir, "event_date", incremental=True)
+
+        assert _exported_ids(rebuilt, output_dir) == list(range(4))
+    finally:
+        rebuilt.close()
+
+
+def test_loader_is_shared_per_database_file(tmp_path):
+    db_path = str(tmp_path / "shared.duckdb")
+
+    first = DuckDBLoader(db_path, data_path=tmp_path / "data")
+
+    assert DuckDBLoader(db_path, data_path=tmp_path / "data") is first
+    with pytest.raises(ValueError):
+        DuckDBLoader(db_path, data_path=tmp_path / "other")
+
+
+def test_in_memory_loaders_are_not_shared(tmp_path):
+    first = DuckDBLoader(":memory:", data_path=tmp_path / "data")
+    second = DuckDBLoader(":memory:", data_path=tmp_path / "data")
+    try:
+        first.execute("CREATE TABLE only_in_first (id INTEGER)")
+
+        assert second is not first
+        assert second.table_count("only_in_first") == 0
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,75 @@
+"""Tests for the Bronze transformer."""
+import json
+from datetime import datetime
+
+import pytest
+
+from src.transformer import BronzeTransformer, _dumps_message, read_bronze_manifest
+
+
+def _message(items: str) -> dict:
+    return {
+        "message_id": "m-1",
+        "receipt_handle": "rh-1",
+        "body": {"event_name": "view_item", "items": items},
+    }
+
+
+def test_dumps_message_keeps_integers_wider_than_64_bits():
+    message = {"body": {"items": [{"item_id": 12345678901234567890123}]}}
+
+    assert json.loads(_dumps_message(message)) == message
+
+
+def test_save_batch_writes_20_digit_item_values(tmp_path):
+    bronze = BronzeTransformer(tmp_path, compression=None)
+    try:
+        paths = bronze.save_batch([_message("[{item_id=98765432109876543210, item_name=Phone}]")])
+    finally:
+        bronze.close()
+
+    assert len(paths) == 1
+    assert bronze.last_saved_count == 1
+    lines = open(paths[0]).read().splitlines()
+    assert len(lines) == 1
+    items = json.loads(lines[0])["body"]["items"]
+    assert items == [{"item_id": 98765432109876543210, "item_name": "Phone"}]
+
+
+def test_save_batch_raises_on_values_that_are_not_json(tmp_path):
+    message = _message("[{item_id=1}]")
+    message["body"]["extra"] = object()
+    bronze = BronzeTransformer(tmp_path, compression=None)
+    try:
+        with pytest.raises(TypeError):
+            bronze.save_batch([message])
+    finally:
+        bronze.close()
+
+
+def test_raw_shards_stay_open_across_interleaved_partitions(tmp_path):
+    bronze = BronzeTransformer(tmp_path, compression=None)
+    try:
+        for hour in range(6):
+            day = 1 if hour % 2 else 2
+            bronze.save_raw_message(_message("[{item_id=1}]"), datetime(2024, 1, day, hour))
+        shard_paths = {shard.path for shard in bronze._raw_shards.values()}
+    finally:
+        bronze.close()
+
+    assert len(shard_paths) == 2
+    manifest = read_bronze_manifest(tmp_path)
+    assert sorted(entry["messages"] for entry in manifest) == [3, 3]
+    assert all(entry["bytes"] > 0 for entry in manifest)
+
+
+def test_save_batch_returns_the_batch_file_once(tmp_path):
+    bronze = BronzeTransformer(tmp_path, compression=None)
+    try:
+        paths = bronze.save_batch([_message("[{item_id=1}]"), _message("[{item_id=2}]")])
+    finally:
+        bronze.close()
+
+    assert len(paths) == 1
+    assert bronze.last_saved_count == 2
+    assert len(open(paths[0]).read().splitlines()) == 2